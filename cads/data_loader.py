@@ -9,20 +9,170 @@ and data validation.
 
 import os
 import sys
+import time
+import hashlib
+import importlib.util
 import pandas as pd
 import numpy as np
-import psycopg2
+from psycopg2.extras import execute_values
 from sqlalchemy import create_engine
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 import logging
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import re
+from functools import lru_cache
+from pathlib import Path
+import torch
+
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+try:
+    import pyarrow  # noqa: F401 - pandas' Parquet engine
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dimensionality of the sentence embeddings stored in cads_works.embedding;
+# must match EMBEDDING_MODEL (e.g. 768 for all-mpnet-base-v2)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+# Shared read-only zero vector returned for blank texts
+_EMPTY_EMBEDDING = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+_EMPTY_EMBEDDING.flags.writeable = False
+
+# Batch size for SentenceTransformer.encode
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMB_BATCH", "64"))
+
+# Maximum number of texts handed to a single encode call
+EMBEDDING_ENCODE_CHUNK = 10000
+
+# Maximum age of the local Parquet snapshot of the works table (0 disables it)
+SNAPSHOT_TTL_SECONDS = int(os.getenv("CADS_SNAPSHOT_TTL", "86400"))
+
+# Above this many texts, encode with a multi-process pool on 8+ core machines
+MULTIPROCESS_MIN_TEXTS = 2000
+
+# Let BLAS/torch use every available core for batched encoding
+torch.set_num_threads(os.cpu_count() or 1)
+
+
+# Columns load_cads_data_with_researchers can select, mapped to their SQL expression
+CADS_COLUMNS = {
+    'id': 'w.id',
+    'openalex_id': 'w.openalex_id',
+    'title': 'w.title',
+    'abstract': 'w.abstract',
+    'keywords': 'w.keywords',
+    'publication_year': 'w.publication_year',
+    'doi': 'w.doi',
+    'citations': 'w.citations',
+    'embedding': 'w.embedding::real[]',
+    'researcher_id': 'w.researcher_id',
+    'full_name': 'r.full_name',
+    'department': 'r.department',
+    'h_index': 'r.h_index',
+}
+
+# Columns used by process_embeddings and validate_data
+DEFAULT_CADS_COLUMNS = (
+    'id', 'title', 'abstract', 'embedding', 'full_name',
+    'department', 'h_index', 'citations', 'publication_year'
+)
+
+@lru_cache(maxsize=None)
+def _pgvector_template(dimensions: int) -> str:
+    """Build the %-format template for a pgvector literal of the given size."""
+    return '[' + ','.join(['%.9g'] * dimensions) + ']'
+
+
+def sort_works(df: pd.DataFrame, sort_columns: List[str], ascending: List[bool]) -> pd.DataFrame:
+    """
+    Order works deterministically for the position-keyed clustering artifacts.
+    
+    Args:
+        df: Works DataFrame
+        sort_columns: Columns to sort by, most significant first
+        ascending: Sort direction for each column
+        
+    Returns:
+        Sorted DataFrame with a fresh RangeIndex
+    """
+    return df.sort_values(
+        sort_columns,
+        ascending=ascending,
+        kind='stable',
+        na_position='first',
+        # ids may arrive as UUID objects or strings depending on the driver
+        key=lambda column: column.astype(str) if column.name == 'id' else column
+    ).reset_index(drop=True)
+
+
+class OnnxSentenceEncoder:
+    """
+    ONNX Runtime replacement for SentenceTransformer.encode.
+    
+    Loads an int8-quantized export of the sentence transformer (see
+    README.md) and reproduces its mean pooling + L2 normalisation.
+    """
+    
+    def __init__(self, model_path: Path):
+        """Load the tokenizer and ONNX model from model_path."""
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = os.cpu_count() or 1
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_path,
+            provider='CPUExecutionProvider',
+            session_options=session_options
+        )
+    
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """
+        Encode texts into normalised sentence embeddings.
+        
+        Args:
+            texts: A single text or list of texts
+            batch_size: Number of texts per inference call
+            
+        Returns:
+            float32 numpy array (1-D for a single text, 2-D for a list)
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors='np'
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+            
+            # Mean pooling over non-padding tokens
+            mask = inputs['attention_mask'][..., np.newaxis].astype(np.float32)
+            pooled = (np.asarray(token_embeddings) * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        
+        embeddings = np.concatenate(batches)
+        return embeddings[0] if single else embeddings
+
 
 class DataProcessor:
     """
@@ -41,54 +191,102 @@ class DataProcessor:
         if not self.database_url:
             raise ValueError("DATABASE_URL must be set in .env file")
         
-        # Initialize database connection
-        self.engine = create_engine(self.database_url)
+        # Initialize database connection pool; connections are reused across
+        # queries instead of paying a TCP + TLS + auth handshake each time
+        self.engine = create_engine(
+            self.database_url,
+            pool_size=4,
+            pool_pre_ping=True,
+            pool_recycle=1800
+        )
         
         # Initialize embedding model (lazy loading)
         self._embedding_model = None
         self.embedding_model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         
+        # Optional int8-quantized ONNX export of the model for faster CPU inference
+        self.onnx_model_path = Path(os.getenv(
+            "EMBEDDING_ONNX_PATH", Path(__file__).parent / 'data' / 'minilm-onnx-int8'
+        ))
+        
+        # Local Parquet snapshots of the works table
+        self.snapshot_dir = Path(__file__).parent / 'data'
+        
+        # Embeddings computed on previous runs, keyed by backend + content hash
+        self.embedding_cache_path = Path(__file__).parent / 'data' / 'emb_cache.npz'
+        self._emb_cache = self.load_embedding_cache()
+        
         logger.info("DataProcessor initialized successfully")
     
     @property
     def embedding_model(self):
         """Lazy load the embedding model to save memory."""
         if self._embedding_model is None:
-            logger.info(f"Loading embedding model: {self.embedding_model_name}")
-            self._embedding_model = SentenceTransformer(self.embedding_model_name)
+            if self.onnx_model_path.is_dir():
+                try:
+                    logger.info(f"Loading ONNX embedding model: {self.onnx_model_path}")
+                    self._embedding_model = OnnxSentenceEncoder(self.onnx_model_path)
+                except ImportError as e:
+                    logger.warning(f"ONNX Runtime not available, using SentenceTransformer: {e}")
+            
+            if self._embedding_model is None:
+                logger.info(f"Loading embedding model: {self.embedding_model_name}")
+                self._embedding_model = SentenceTransformer(self.embedding_model_name)
         return self._embedding_model
     
     def get_database_connection(self):
-        """Get a raw database connection for custom queries."""
-        return psycopg2.connect(self.database_url)
+        """
+        Get a raw database connection for custom queries.
+        
+        The connection is checked out of the engine's pool; close() returns
+        it to the pool rather than disconnecting.
+        """
+        return self.engine.raw_connection()
     
-    def parse_pgvector_embedding(self, embedding_str: str) -> np.ndarray:
+    def parse_pgvector_embedding(self, embedding_str, _fromstring=np.fromstring) -> np.ndarray:
         """
         Parse pgvector embedding string format to numpy array.
         
         Args:
-            embedding_str: String representation of embedding from database
+            embedding_str: String representation of embedding from database,
+                or a float4[] array already decoded by the driver
             
         Returns:
             numpy array of embedding values
         """
-        if not embedding_str or embedding_str == 'None':
+        if isinstance(embedding_str, (list, tuple, np.ndarray)):
+            return np.asarray(embedding_str, dtype=np.float32) if len(embedding_str) else None
+        
+        if not isinstance(embedding_str, str) or not embedding_str or embedding_str == 'None':
             return None
         
-        try:
-            # Remove brackets and split by comma
-            embedding_str = str(embedding_str).strip()
-            if embedding_str.startswith('[') and embedding_str.endswith(']'):
-                values_str = embedding_str[1:-1]
-                values = [float(x.strip()) for x in values_str.split(',')]
-                return np.array(values)
-            else:
+        if embedding_str[0] != '[' or embedding_str[-1] != ']':
+            embedding_str = embedding_str.strip()
+            if not embedding_str.startswith('[') or not embedding_str.endswith(']'):
                 logger.warning(f"Unexpected embedding format: {embedding_str[:50]}...")
                 return None
-        except Exception as e:
+        
+        # Parse the comma-separated values in C rather than per float in Python
+        try:
+            return _fromstring(embedding_str[1:-1], sep=',', dtype=np.float32)
+        except ValueError as e:
             logger.error(f"Error parsing embedding: {e}")
             return None
     
+    def format_pgvector_embedding(self, embedding: np.ndarray) -> str:
+        """
+        Format an embedding as a pgvector literal.
+        
+        Args:
+            embedding: Numpy array of embedding values
+            
+        Returns:
+            String in pgvector '[v1,v2,...]' format
+        """
+        values = np.asarray(embedding, dtype=np.float32).tolist()
+        # One C-level % per vector; 9 significant digits round-trip float32 exactly
+        return _pgvector_template(len(values)) % tuple(values)
+    
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for given text using sentence transformer.
@@ -99,52 +297,280 @@ class DataProcessor:
         Returns:
             numpy array of embedding values
         """
-        if not text or text.strip() == '':
-            return np.zeros(384)  # Default embedding size
+        # Blank or placeholder text never reaches the transformer
+        if not text or text.strip().lower() in ('', 'none'):
+            return _EMPTY_EMBEDDING
         
         try:
             # Combine title and abstract for better embeddings
             embedding = self.embedding_model.encode(text)
-            return embedding
+            return embedding.astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
-            return np.zeros(384)
+            return _EMPTY_EMBEDDING
+    
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a batch of texts, reusing cached results.
+        
+        Args:
+            texts: Texts to generate embeddings for
+            
+        Returns:
+            numpy array of shape (len(texts), embedding_dim)
+        """
+        backend = self.embedding_backend
+        keys, results = self._lookup_cached_embeddings(texts, backend)
+        
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        if missing and self._embedding_model is None:
+            # Loading may fall back from ONNX to SentenceTransformer; look the
+            # texts up again under the backend that will actually encode them
+            self.embedding_model
+            if self.embedding_backend != backend:
+                keys, results = self._lookup_cached_embeddings(texts, self.embedding_backend)
+                missing = [i for i, embedding in enumerate(results) if embedding is None]
+        
+        logger.info(f"Embedding cache hits: {len(texts) - len(missing)}/{len(texts)}")
+        
+        if missing:
+            encoded = self.encode_texts([texts[i] for i in missing])
+            for i, embedding in zip(missing, encoded):
+                results[i] = embedding.astype(np.float32, copy=False)
+                self._emb_cache[keys[i]] = results[i]
+            self.save_embedding_cache()
+        
+        return np.vstack(results).astype(np.float32, copy=False)
+    
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the sentence transformer in length-sorted batches.
+        
+        Args:
+            texts: Texts to encode
+            
+        Returns:
+            numpy array of shape (len(texts), embedding_dim)
+        """
+        # Sort by length so each mini-batch pads to a similar length,
+        # then scatter the results back into the caller's order
+        order = np.argsort([len(text) for text in texts], kind='stable')
+        sorted_texts = [texts[i] for i in order]
+        
+        model = self.embedding_model
+        cpu_count = os.cpu_count() or 1
+        if (len(texts) > MULTIPROCESS_MIN_TEXTS and cpu_count >= 8
+                and hasattr(model, 'start_multi_process_pool')):
+            sorted_embeddings = self._encode_multi_process(sorted_texts, cpu_count)
+        else:
+            sorted_embeddings = self._encode_in_chunks(sorted_texts)
+        
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+    
+    def _encode_in_chunks(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in the current process, at most EMBEDDING_ENCODE_CHUNK per call."""
+        chunks = []
+        for start in range(0, len(texts), EMBEDDING_ENCODE_CHUNK):
+            chunks.append(self.embedding_model.encode(
+                texts[start:start + EMBEDDING_ENCODE_CHUNK],
+                batch_size=EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=False
+            ))
+        return np.concatenate(chunks)
+    
+    def _encode_multi_process(self, texts: List[str], cpu_count: int) -> np.ndarray:
+        """Encode texts with a pool of worker processes, one model copy each."""
+        n_processes = min(4, cpu_count // 2)
+        logger.info(f"Encoding {len(texts)} texts with {n_processes} worker processes")
+        
+        # Split the cores between workers so their BLAS threads don't oversubscribe
+        previous_threads = torch.get_num_threads()
+        torch.set_num_threads(max(1, cpu_count // n_processes))
+        
+        model = self.embedding_model
+        pool = model.start_multi_process_pool(['cpu'] * n_processes)
+        try:
+            return model.encode_multi_process(
+                texts,
+                pool,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                chunk_size=500
+            )
+        finally:
+            model.stop_multi_process_pool(pool)
+            torch.set_num_threads(previous_threads)
+    
+    @property
+    def embedding_backend(self) -> str:
+        """
+        Identify the encoder that produces this processor's embeddings.
+        
+        ONNX and SentenceTransformer outputs differ slightly, so cached
+        embeddings are keyed by backend. Before the model is loaded this
+        predicts the choice made by embedding_model.
+        """
+        if self._embedding_model is None:
+            use_onnx = self.onnx_model_path.is_dir() and all(
+                importlib.util.find_spec(name) is not None
+                for name in ('onnxruntime', 'optimum', 'transformers')
+            )
+        else:
+            use_onnx = isinstance(self._embedding_model, OnnxSentenceEncoder)
+        
+        if use_onnx:
+            return f"onnx:{self.onnx_model_path.resolve()}"
+        return f"torch:{self.embedding_model_name}"
     
-    def load_cads_data_with_researchers(self) -> pd.DataFrame:
+    def _lookup_cached_embeddings(self, texts: List[str], backend: str):
+        """Return (keys, cached embedding or None per text) for a backend."""
+        keys = [self._embedding_cache_key(text, backend) for text in texts]
+        return keys, [self._emb_cache.get(key) for key in keys]
+    
+    def _embedding_cache_key(self, text: str, backend: str) -> str:
+        """Cache key for a text; includes the backend so model swaps invalidate it."""
+        return hashlib.sha1(f"{backend}\n{text}".encode('utf-8')).hexdigest()[:16]
+    
+    def load_embedding_cache(self) -> Dict[str, np.ndarray]:
+        """
+        Load previously computed embeddings from disk.
+        
+        Returns:
+            Dictionary mapping cache key to embedding vector
+        """
+        if not self.embedding_cache_path.exists():
+            return {}
+        
+        try:
+            with np.load(self.embedding_cache_path) as cache:
+                return dict(zip(cache['keys'].tolist(), cache['embeddings']))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.embedding_cache_path}: {e}")
+            return {}
+    
+    def save_embedding_cache(self):
+        """Persist the in-memory embedding cache to disk."""
+        if not self._emb_cache:
+            return
+        
+        try:
+            self.embedding_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(
+                self.embedding_cache_path,
+                keys=np.array(list(self._emb_cache.keys())),
+                embeddings=np.vstack(list(self._emb_cache.values())).astype(np.float32, copy=False)
+            )
+        except Exception as e:
+            logger.warning(f"Could not save embedding cache: {e}")
+    
+    def load_cads_data_with_researchers(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Load CADS works data joined with researcher information.
         
+        Args:
+            columns: Columns to select (keys of CADS_COLUMNS); defaults to
+                DEFAULT_CADS_COLUMNS, the set the pipeline actually uses
+            
         Returns:
             DataFrame with works and researcher data
         """
-        query = """
+        columns = list(columns or DEFAULT_CADS_COLUMNS)
+        unknown = [column for column in columns if column not in CADS_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown CADS columns: {unknown}")
+        
+        select_list = ",\n            ".join(
+            f"{CADS_COLUMNS[column]} AS {column}" for column in columns
+        )
+        query = f"""
         SELECT 
-            w.id,
-            w.openalex_id,
-            w.title,
-            w.abstract,
-            w.keywords,
-            w.publication_year,
-            w.doi,
-            w.citations,
-            w.embedding,
-            r.full_name,
-            r.department,
-            r.h_index
+            {select_list}
         FROM cads_works w
         JOIN cads_researchers r ON w.researcher_id = r.id
-        ORDER BY w.publication_year DESC, w.citations DESC
         """
         
+        snapshot_path = self._snapshot_path(columns)
+        if self._snapshot_is_fresh(snapshot_path):
+            logger.info(f"Loading CADS data from local snapshot {snapshot_path.name}...")
+            df = pd.read_parquet(snapshot_path)
+            logger.info(f"Loaded {len(df)} works with researcher data")
+            return df
+        
         try:
             logger.info("Loading CADS data with researcher information...")
-            df = pd.read_sql(query, self.engine)
+            if cx is not None:
+                # connectorx streams Arrow record batches, avoiding a Python
+                # object per cell before the DataFrame is built
+                df = cx.read_sql(self.database_url, query, return_type='pandas')
+            else:
+                df = self._read_sql_psycopg2(query)
+            
+            # Sort client-side rather than in the database; cached UMAP/cluster
+            # artifacts are stored by row position so the order must stay stable.
+            # The query has no ORDER BY, so id breaks year/citation ties
+            sort_columns = [c for c in ('publication_year', 'citations') if c in df.columns]
+            if sort_columns:
+                ascending = [False] * len(sort_columns)
+                if 'id' in df.columns:
+                    sort_columns.append('id')
+                    ascending.append(True)
+                df = sort_works(df, sort_columns, ascending)
+            
             logger.info(f"Loaded {len(df)} works with researcher data")
+            self._write_snapshot(df, snapshot_path)
             return df
         except Exception as e:
             logger.error(f"Error loading CADS data: {e}")
             raise
     
+    def _snapshot_path(self, columns: List[str]) -> Path:
+        """Parquet snapshot path for a column selection."""
+        key = hashlib.sha1(','.join(columns).encode('utf-8')).hexdigest()[:8]
+        return self.snapshot_dir / f"works_{key}.parquet"
+    
+    def _snapshot_is_fresh(self, snapshot_path: Path) -> bool:
+        """Whether a snapshot exists and is younger than SNAPSHOT_TTL_SECONDS."""
+        if not PARQUET_AVAILABLE or SNAPSHOT_TTL_SECONDS <= 0 or not snapshot_path.exists():
+            return False
+        return time.time() - snapshot_path.stat().st_mtime < SNAPSHOT_TTL_SECONDS
+    
+    def _write_snapshot(self, df: pd.DataFrame, snapshot_path: Path):
+        """Save df as a Parquet snapshot for later runs."""
+        if not PARQUET_AVAILABLE or SNAPSHOT_TTL_SECONDS <= 0:
+            return
+        
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(snapshot_path, engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            logger.warning(f"Could not write data snapshot {snapshot_path}: {e}")
+    
+    def invalidate_snapshots(self):
+        """Remove local data snapshots so the next load reads the database."""
+        for snapshot_path in self.snapshot_dir.glob('works_*.parquet'):
+            snapshot_path.unlink(missing_ok=True)
+    
+    def _read_sql_psycopg2(self, query: str) -> pd.DataFrame:
+        """
+        Run a query through psycopg2 and build a DataFrame from the rows.
+        
+        float4[] columns are decoded by the driver instead of being
+        re-parsed from text in Python.
+        """
+        conn = self.get_database_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query)
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        return pd.DataFrame(rows, columns=columns)
+    
     def process_embeddings(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
         """
         Process embeddings for the dataset, generating missing ones.
@@ -157,28 +583,54 @@ class DataProcessor:
         """
         logger.info("Processing embeddings...")
         
-        embeddings_list = []
-        missing_embeddings = 0
-        
-        for idx, row in df.iterrows():
-            # Try to parse existing embedding
-            embedding = self.parse_pgvector_embedding(row['embedding'])
-            
-            if embedding is None:
-                # Generate new embedding from title and abstract
-                text_content = f"{row['title']} {row['abstract'] or ''}"
-                embedding = self.generate_embedding(text_content)
-                missing_embeddings += 1
+        # Plain column arrays avoid building a Series/tuple per row
+        ids = df['id'].to_numpy()
+        # NULL titles and abstracts may arrive as None or NaN depending on the loader
+        titles = df['title'].fillna('').to_numpy()
+        abstracts = df['abstract'].fillna('').to_numpy()
+        stored_embeddings = df['embedding'].to_numpy()
+        
+        # Rows with a NULL embedding never need to reach the parser
+        has_embedding = df['embedding'].notna().to_numpy()
+        
+        # Fill one preallocated float32 matrix in place instead of stacking
+        # a list of small per-row arrays at the end
+        embeddings_array = np.empty((len(df), EMBEDDING_DIM), dtype=np.float32)
+        missing_mask = np.ones(len(df), dtype=bool)
+        
+        for i in np.flatnonzero(has_embedding):
+            embedding = self.parse_pgvector_embedding(stored_embeddings[i])
+            if embedding is not None and embedding.shape == (EMBEDDING_DIM,):
+                embeddings_array[i] = embedding
+                missing_mask[i] = False
+        
+        # Collect every row still missing an embedding so they are encoded in one batch
+        missing_positions = np.flatnonzero(missing_mask)
+        missing_texts = [f"{titles[i]} {abstracts[i]}" for i in missing_positions]
+        embeddings_array[missing_positions] = _EMPTY_EMBEDDING
+        
+        # Blank or placeholder text never reaches the transformer; those rows
+        # keep the zero vector, which is not written back to the database
+        encodable = [j for j, text in enumerate(missing_texts) if text.strip().lower() not in ('', 'none')]
+        encode_positions = missing_positions[encodable]
+        generated = 0
+        
+        if encodable:
+            try:
+                new_embeddings = self.generate_embeddings([missing_texts[j] for j in encodable])
+            except Exception as e:
+                # Fall back to zero vectors for this run; nothing is saved, so
+                # the rows are retried next time
+                logger.error(f"Error generating embeddings: {e}")
+            else:
+                embeddings_array[encode_positions] = new_embeddings
+                generated = len(encodable)
                 
-                # Save embedding back to database
-                self.save_embedding_to_database(row['id'], embedding)
-            
-            embeddings_list.append(embedding)
-        
-        embeddings_array = np.array(embeddings_list)
+                # Save all generated embeddings back to database in one transaction
+                self.save_embeddings_to_database([ids[i] for i in encode_positions], new_embeddings)
         
         logger.info(f"Processed {len(embeddings_array)} embeddings")
-        logger.info(f"Generated {missing_embeddings} missing embeddings")
+        logger.info(f"Generated {generated} of {len(missing_texts)} missing embeddings")
         
         return df, embeddings_array
     
@@ -190,20 +642,50 @@ class DataProcessor:
             work_id: ID of the work
             embedding: Numpy array of embedding values
         """
+        self.save_embeddings_to_database([work_id], [embedding])
+    
+    def save_embeddings_to_database(self, work_ids: List[str], embeddings):
+        """
+        Save a batch of embeddings to database with a single bulk UPDATE.
+        
+        Args:
+            work_ids: IDs of the works
+            embeddings: Embedding vectors, in the same order as work_ids
+        """
+        if len(work_ids) == 0:
+            return
+        
         try:
-            # Convert numpy array to pgvector format
-            embedding_str = '[' + ','.join(map(str, embedding)) + ']'
+            # Convert numpy arrays to pgvector format
+            rows = [
+                (self.format_pgvector_embedding(embedding), str(work_id))
+                for work_id, embedding in zip(work_ids, embeddings)
+            ]
             
-            with self.get_database_connection() as conn:
+            conn = self.get_database_connection()
+            try:
                 cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE cads_works SET embedding = %s WHERE id = %s",
-                    (embedding_str, work_id)
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE cads_works SET embedding = data.emb::vector
+                    FROM (VALUES %s) AS data(emb, id)
+                    WHERE cads_works.id = data.id::uuid
+                    """,
+                    rows,
+                    page_size=500
                 )
                 conn.commit()
                 cursor.close()
+            finally:
+                conn.close()
+            
+            logger.info(f"Saved {len(rows)} embeddings to database")
+            
+            # Snapshots still hold the old NULL embeddings
+            self.invalidate_snapshots()
         except Exception as e:
-            logger.error(f"Error saving embedding for work {work_id}: {e}")
+            logger.error(f"Error saving {len(work_ids)} embeddings: {e}")
     
     def validate_data(self, df: pd.DataFrame, embeddings: np.ndarray) -> Dict:
         """
@@ -273,7 +755,7 @@ class DataProcessor:
             validation_results['validation_passed'] = False
             logger.error("No works found in dataset")
         
-        if validation_results['embedding_dimensions'] != 384:
+        if validation_results['embedding_dimensions'] != EMBEDDING_DIM:
             validation_results['validation_passed'] = False
             logger.error(f"Unexpected embedding dimensions: {validation_results['embedding_dimensions']}")
         
@@ -9,24 +9,70 @@ Coordinates data loading, UMAP reduction, HDBSCAN clustering, and theme generati
 import os
 import sys
 import json
+import hashlib
+from collections import namedtuple
 import numpy as np
 import pandas as pd
 from pathlib import Path
 from dotenv import load_dotenv
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import core modules
-from data_loader import DataProcessor
+from data_loader import DataProcessor, DEFAULT_CADS_COLUMNS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dimensions kept by the TruncatedSVD pre-reduction before UMAP (0 disables it)
+UMAP_SVD_COMPONENTS = int(os.getenv("UMAP_SVD_COMPONENTS", "50"))
+
+# Directory holding the cached UMAP/HDBSCAN artifacts
+CLUSTER_CACHE_DIR = Path(__file__).parent / 'data'
+
+# Files making up one set of cached clustering artifacts
+ClusterCachePaths = namedtuple('ClusterCachePaths', 'umap_json clustering_json umap_npy labels_npy fingerprint')
+
+
+def cluster_cache_paths(data_dir):
+    """Return the clustering artifact paths under data_dir, shared by cache reader and writer."""
+    return ClusterCachePaths(
+        umap_json=data_dir / 'umap_coordinates.json',
+        clustering_json=data_dir / 'clustering_results.json',
+        umap_npy=data_dir / 'umap_coordinates.npy',
+        labels_npy=data_dir / 'cluster_labels.npy',
+        fingerprint=data_dir / 'cluster_cache_fingerprint.json'
+    )
+
+
+def write_json(path, obj):
+    """
+    Write obj to path as compact JSON, using orjson when it is installed.
+    
+    Args:
+        path: Output file path
+        obj: JSON-serializable object
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, separators=(',', ':'))
+
 
-def load_and_process_data():
+def load_and_process_data(processor=None):
     """
     Main function to load and process CADS research data.
     
+    Args:
+        processor: Optional DataProcessor to reuse instead of creating one
+        
     Returns:
         Dictionary with processed data and embeddings
     """
@@ -34,7 +80,8 @@ def load_and_process_data():
     
     try:
         # Initialize data processor
-        processor = DataProcessor()
+        if processor is None:
+            processor = DataProcessor()
         
         # Process the production dataset
         result = processor.process_production_dataset()
@@ -47,10 +94,95 @@ def load_and_process_data():
         raise
 
 
+def data_fingerprint(data):
+    """
+    Fingerprint the works (and their order) that clustering artifacts belong to.
+    
+    Args:
+        data: DataFrame with an 'id' column
+        
+    Returns:
+        Hex digest identifying the row set and order
+    """
+    digest = hashlib.sha1()
+    for work_id in data['id'].astype(str):
+        digest.update(work_id.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def load_cached_clusters(data_dir):
+    """
+    Load pre-computed UMAP coordinates and cluster labels, if present.
+    
+    Args:
+        data_dir: Directory holding the clustering artifacts
+        
+    Returns:
+        Tuple of (umap_coords, cluster_labels), or None if not cached
+    """
+    paths = cluster_cache_paths(data_dir)
+    
+    if paths.umap_npy.exists() and paths.labels_npy.exists():
+        # Binary artifacts load without any JSON parsing
+        umap_coords = np.load(paths.umap_npy, mmap_mode='r')
+        cluster_labels = np.load(paths.labels_npy)
+    
+    elif paths.umap_json.exists() and paths.clustering_json.exists():
+        # Load UMAP coordinates
+        with open(paths.umap_json, 'r') as f:
+            umap_data = json.load(f)
+        
+        # Load clustering results
+        with open(paths.clustering_json, 'r') as f:
+            clustering_data = json.load(f)
+        
+        # Convert to numpy arrays
+        umap_coords = np.array([[point['x'], point['y']] for point in umap_data])
+        cluster_labels = np.array([point['cluster'] for point in clustering_data])
+        
+        # Write binary copies so later runs skip the JSON parse
+        np.save(paths.umap_npy, umap_coords)
+        np.save(paths.labels_npy, cluster_labels)
+    
+    else:
+        return None
+    
+    logger.info(f"Loaded {len(umap_coords)} pre-computed UMAP coordinates")
+    return umap_coords, cluster_labels
+
+
+def cached_clusters_match(data_dir, data, umap_coords):
+    """
+    Check that cached clustering artifacts were computed for this data.
+    
+    Args:
+        data_dir: Directory holding the clustering artifacts
+        data: DataFrame the artifacts will be paired with
+        umap_coords: Cached UMAP coordinates
+        
+    Returns:
+        True if the cache can be reused
+    """
+    if len(umap_coords) != len(data):
+        return False
+    
+    fingerprint_file = cluster_cache_paths(data_dir).fingerprint
+    if not fingerprint_file.exists():
+        # A matching size alone could pair coordinates with the wrong works
+        return False
+    
+    with open(fingerprint_file, 'r') as f:
+        return json.load(f).get('fingerprint') == data_fingerprint(data)
+
+
 def compute_clusters(data_dict=None):
     """
     Compute clusters using UMAP and HDBSCAN.
     
+    When no data is provided and up-to-date clustering results are cached,
+    only the works table is loaded; embeddings are not regenerated.
+    
     Args:
         data_dict: Optional dictionary with data and embeddings
         
@@ -60,34 +192,34 @@ def compute_clusters(data_dict=None):
     logger.info("Computing clusters...")
     
     try:
+        # Check if we have pre-computed results before touching embeddings
+        data_dir = CLUSTER_CACHE_DIR
+        paths = cluster_cache_paths(data_dir)
+        
+        cached = load_cached_clusters(data_dir)
+        
+        # One processor (and connection pool) serves both the cache probe and a full load
+        processor = DataProcessor() if data_dict is None else None
+        
+        if cached is not None and data_dict is None:
+            # Warm cache: the works themselves are enough, skip embedding generation
+            data = processor.load_cads_data_with_researchers(
+                columns=[column for column in DEFAULT_CADS_COLUMNS if column != 'embedding']
+            )
+            if cached_clusters_match(data_dir, data, cached[0]):
+                data_dict = {'data': data, 'embeddings': None}
+        
         # If no data provided, load it
         if data_dict is None:
-            data_dict = load_and_process_data()
+            data_dict = load_and_process_data(processor)
         
         data = data_dict['data']
         embeddings = data_dict['embeddings']
         
-        # Check if we have pre-computed results
-        data_dir = Path(__file__).parent / 'data'
-        umap_file = data_dir / 'umap_coordinates.json'
-        clustering_file = data_dir / 'clustering_results.json'
-        
-        if umap_file.exists() and clustering_file.exists():
-            logger.info("Loading pre-computed clustering results...")
-            
-            # Load UMAP coordinates
-            with open(umap_file, 'r') as f:
-                umap_data = json.load(f)
-            
-            # Load clustering results
-            with open(clustering_file, 'r') as f:
-                clustering_data = json.load(f)
+        if cached is not None and cached_clusters_match(data_dir, data, cached[0]):
+            logger.info("Using pre-computed clustering results...")
+            umap_coords, cluster_labels = cached
             
-            # Convert to numpy arrays
-            umap_coords = np.array([[point['x'], point['y']] for point in umap_data])
-            cluster_labels = np.array([point['cluster'] for point in clustering_data])
-            
-            logger.info(f"Loaded {len(umap_coords)} UMAP coordinates")
             logger.info(f"Found {len(set(cluster_labels))} unique clusters")
             
             return {
@@ -95,28 +227,47 @@ def compute_clusters(data_dict=None):
                 'embeddings': embeddings,
                 'umap_coordinates': umap_coords,
                 'cluster_labels': cluster_labels,
-                'n_clusters': len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0)
+                'n_clusters': len(set(cluster_labels)) - (1 if -1 in cluster_labels else 0),
+                'validation_passed': data_dict.get('validation_passed')
             }
         
         else:
-            logger.info("Pre-computed clustering results not found")
+            logger.info("Pre-computed clustering results not found or stale")
             logger.info("Running UMAP and HDBSCAN clustering...")
             
             try:
-                # Import ML libraries
-                import umap
+                # Import ML libraries, preferring the RAPIDS GPU UMAP when installed
+                try:
+                    from cuml.manifold import UMAP
+                    logger.info("Using cuML GPU UMAP")
+                except ImportError:
+                    from umap import UMAP
                 import hdbscan
                 
+                # On unit-normalised vectors euclidean distance ranks neighbours
+                # exactly like cosine, and is cheaper inside UMAP
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                umap_input = embeddings / np.where(norms == 0, 1, norms)
+                
+                # Pre-reduce with truncated SVD to cut UMAP's neighbour search cost
+                if 0 < UMAP_SVD_COMPONENTS < min(umap_input.shape):
+                    from sklearn.decomposition import TruncatedSVD
+                    logger.info(f"Reducing embeddings to {UMAP_SVD_COMPONENTS} dimensions with TruncatedSVD...")
+                    umap_input = TruncatedSVD(
+                        n_components=UMAP_SVD_COMPONENTS,
+                        random_state=42
+                    ).fit_transform(umap_input)
+                
                 # Run UMAP dimensionality reduction
                 logger.info("Running UMAP dimensionality reduction...")
-                umap_model = umap.UMAP(
+                umap_model = UMAP(
                     n_neighbors=15,
                     min_dist=0.1,
                     n_components=2,
-                    metric='cosine',
+                    metric='euclidean',
                     random_state=42
                 )
-                umap_coords = umap_model.fit_transform(embeddings)
+                umap_coords = umap_model.fit_transform(umap_input)
                 logger.info(f"UMAP completed: {umap_coords.shape}")
                 
                 # Run HDBSCAN clustering
@@ -135,14 +286,20 @@ def compute_clusters(data_dict=None):
                 logger.info("Saving clustering results...")
                 
                 # Save UMAP coordinates
-                umap_data = [{'x': float(coord[0]), 'y': float(coord[1])} for coord in umap_coords]
-                with open(umap_file, 'w') as f:
-                    json.dump(umap_data, f, indent=2)
+                umap_data = [{'x': x, 'y': y} for x, y in umap_coords.tolist()]
+                write_json(paths.umap_json, umap_data)
                 
                 # Save clustering results
-                clustering_data = [{'cluster': int(label)} for label in cluster_labels]
-                with open(clustering_file, 'w') as f:
-                    json.dump(clustering_data, f, indent=2)
+                clustering_data = [{'cluster': label} for label in cluster_labels.tolist()]
+                write_json(paths.clustering_json, clustering_data)
+                
+                # Binary copies used by the pipeline on later runs
+                np.save(paths.umap_npy, umap_coords)
+                np.save(paths.labels_npy, cluster_labels)
+                
+                # Record which works the artifacts belong to so stale caches are detected
+                with open(paths.fingerprint, 'w') as f:
+                    json.dump({'n_rows': len(data), 'fingerprint': data_fingerprint(data)}, f)
                 
                 logger.info("Results saved successfully")
                 
@@ -151,7 +308,8 @@ def compute_clusters(data_dict=None):
                     'embeddings': embeddings,
                     'umap_coordinates': umap_coords,
                     'cluster_labels': cluster_labels,
-                    'n_clusters': n_clusters
+                    'n_clusters': n_clusters,
+                    'validation_passed': data_dict.get('validation_passed')
                 }
                 
             except ImportError as e:
@@ -162,6 +320,7 @@ def compute_clusters(data_dict=None):
                     'umap_coordinates': None,
                     'cluster_labels': None,
                     'n_clusters': 0,
+                    'validation_passed': data_dict.get('validation_passed'),
                     'message': 'Clustering requires ML dependencies (umap-learn, hdbscan)'
                 }
             
@@ -185,7 +344,10 @@ def save_results(results_dict, output_dir='data'):
         # Save basic data info
         data_info = {
             'total_works': len(results_dict['data']),
-            'embedding_dimensions': results_dict['embeddings'].shape[1],
+            'embedding_dimensions': (
+                results_dict['embeddings'].shape[1]
+                if results_dict.get('embeddings') is not None else None
+            ),
             'n_clusters': results_dict.get('n_clusters', 0),
             'processing_timestamp': pd.Timestamp.now().isoformat()
         }
@@ -204,11 +366,9 @@ def main():
     try:
         logger.info("Starting CADS processing pipeline...")
         
-        # Load and process data
-        data_results = load_and_process_data()
-        
-        # Compute clusters
-        cluster_results = compute_clusters(data_results)
+        # Compute clusters; data is only loaded and embedded when the
+        # cached clustering results are missing or stale
+        cluster_results = compute_clusters()
         
         # Save results
         save_results(cluster_results)
@@ -218,9 +378,11 @@ def main():
         print("🎉 CADS Processing Pipeline Complete!")
         print("="*50)
         print(f"📊 Total works processed: {len(cluster_results['data'])}")
-        print(f"🧮 Embedding dimensions: {cluster_results['embeddings'].shape[1]}")
+        embeddings = cluster_results['embeddings']
+        print(f"🧮 Embedding dimensions: {embeddings.shape[1] if embeddings is not None else 'N/A (cached clusters)'}")
         print(f"🎯 Number of clusters: {cluster_results.get('n_clusters', 'N/A')}")
-        print(f"✅ Validation passed: {data_results.get('validation_passed', 'N/A')}")
+        validation_passed = cluster_results.get('validation_passed')
+        print(f"✅ Validation passed: {validation_passed if validation_passed is not None else 'N/A'}")
         
         if cluster_results.get('message'):
             print(f"ℹ️  Note: {cluster_results['message']}")
@@ -7,8 +7,15 @@ import os
 import sys
 import re
 import shutil
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Compiled once at import rather than on every HTML file processed
+_SENTRY_DISABLED_RE = re.compile(r'<script[^>]*sentry[^>]*></script>', re.IGNORECASE)
+_SENTRY_ACTIVE_RE = re.compile(r'<!-- Sentry Error Tracking -->.*?</script>', re.DOTALL)
+
 def get_sentry_config():
     """Get Sentry configuration from environment variables"""
     sentry_dsn = os.getenv('SENTRY_DSN')
@@ -20,29 +27,18 @@ def get_sentry_config():
         'release': os.getenv('SENTRY_RELEASE', 'unknown')
     }
 
-def inject_sentry_config(html_content, config):
-    """Inject Sentry configuration into HTML content"""
-    if not config['dsn']:
-        print("⚠️  SENTRY_DSN not found - Sentry will be disabled")
-        # Remove Sentry script tag if no DSN
-        html_content = re.sub(
-            r'<script[^>]*sentry[^>]*></script>',
-            '<!-- Sentry disabled - no DSN provided -->',
-            html_content,
-            flags=re.IGNORECASE
-        )
-        return html_content
-    
-    # Replace the hardcoded Sentry script with dynamic configuration
+@lru_cache(maxsize=None)
+def render_sentry_script(dsn, environment, release):
+    """Render the Sentry loader/init snippet once per configuration"""
     sentry_script = f'''
     <!-- Sentry Error Tracking (Dynamic Configuration) -->
     <script src="https://browser.sentry-cdn.com/7.100.1/bundle.tracing.min.js" integrity="sha384-wbvA2NmqqALPaRHQ4+7eEp6vwvk1cJ4z3UJ3W7xOZFj+g4H5yALFPO9LHoB4cU0K" crossorigin="anonymous"></script>
     <script>
         if (typeof Sentry !== 'undefined') {{
             Sentry.init({{
-                dsn: '{config['dsn']}',
-                environment: '{config['environment']}',
-                release: '{config['release']}',
+                dsn: '{dsn}',
+                environment: '{environment}',
+                release: '{release}',
                 integrations: [
                     new Sentry.BrowserTracing({{
                         // Performance monitoring
@@ -50,7 +46,7 @@ def inject_sentry_config(html_content, config):
                     }}),
                 ],
                 // Performance Monitoring
-                tracesSampleRate: {config['environment'] == 'production' and '0.1' or '1.0'},
+                tracesSampleRate: {environment == 'production' and '0.1' or '1.0'},
                 // Session Replay (optional)
                 replaysSessionSampleRate: 0.1,
                 replaysOnErrorSampleRate: 1.0,
@@ -81,17 +77,61 @@ def inject_sentry_config(html_content, config):
         }}
     </script>
     '''
+    return sentry_script.strip()
+
+def inject_sentry_config(html_content, config):
+    """Inject Sentry configuration into HTML content"""
+    if not config['dsn']:
+        print("⚠️  SENTRY_DSN not found - Sentry will be disabled")
+        # Remove Sentry script tag if no DSN
+        html_content = _SENTRY_DISABLED_RE.sub(
+            lambda match: '<!-- Sentry disabled - no DSN provided -->',
+            html_content
+        )
+        return html_content
     
-    # Replace existing Sentry script tag
-    html_content = re.sub(
-        r'<!-- Sentry Error Tracking -->.*?</script>',
-        sentry_script.strip(),
-        html_content,
-        flags=re.DOTALL
-    )
+    # Replace the hardcoded Sentry script with dynamic configuration
+    sentry_script = render_sentry_script(config['dsn'], config['environment'], config['release'])
+    
+    # Replace existing Sentry script tag; a callable replacement is inserted
+    # verbatim instead of being re-parsed as a template for backslash escapes
+    html_content = _SENTRY_ACTIVE_RE.sub(lambda match: sentry_script, html_content)
     
     return html_content
 
+def write_file_atomic(path, content):
+    """Write content next to path and rename it over the original in one step"""
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=path.parent, prefix=f'.{path.name}.', delete=False
+    ) as tmp:
+        tmp.write(content)
+    try:
+        # Keep the original's permissions rather than the temp file's 0600
+        shutil.copymode(path, tmp.name)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+def process_html_file(job):
+    """Inject Sentry configuration into one HTML file; returns (name, updated)"""
+    html_file, config = job
+    
+    # Read original content
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    # Inject Sentry configuration
+    updated_content = inject_sentry_config(content, config)
+    
+    if updated_content == content:
+        return html_file.name, False
+    
+    # Write updated content; readers never see a half-written file
+    write_file_atomic(html_file, updated_content)
+    return html_file.name, True
+
 def main():
     """Main build process"""
     print("🔨 Building CADS Visualizer with Sentry integration...")
@@ -108,23 +148,20 @@ def main():
     print(f"🌍 Environment: {sentry_config['environment']}")
     print(f"🏷️  Release: {sentry_config['release']}")
     
-    # Process HTML files
+    # Process HTML files; each file is independent, so fan out across cores
     html_files = list(source_dir.glob('*.html'))
-    for html_file in html_files:
-        print(f"📝 Processing {html_file.name}...")
-        
-        # Read original content
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Inject Sentry configuration
-        updated_content = inject_sentry_config(content, sentry_config)
-        
-        # Write updated content
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
-        
-        print(f"✅ Updated {html_file.name}")
+    jobs = [(html_file, sentry_config) for html_file in html_files]
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(process_html_file, jobs))
+    else:
+        results = [process_html_file(job) for job in jobs]
+    
+    for name, updated in results:
+        if updated:
+            print(f"✅ Updated {name}")
+        else:
+            print(f"⏭️  No Sentry markers in {name}, left unchanged")
     
     print("🎉 Build completed successfully!")
 
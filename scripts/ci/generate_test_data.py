@@ -4,11 +4,19 @@ Generate proper test data for CI environment
 Resolves compression ratio and missing file issues in GitHub Actions
 """
 
+import os
 import json
 import gzip
+import shutil
 import sys
+from collections import Counter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -36,6 +44,7 @@ def generate_visualization_data():
     
     # Generate substantial test data (not minimal) for proper compression
     viz_data = generator.generate_visualization_data(num_works=500)
+    works_per_researcher = Counter(w["researcher_name"] for w in viz_data["works"])
     
     # Add more realistic data structure
     viz_data.update({
@@ -50,7 +59,7 @@ def generate_visualization_data():
                 "id": i + 1,
                 "name": f"Dr. Test Researcher {i + 1}",
                 "department": "Computer Science",
-                "works_count": len([w for w in viz_data["works"] if w["researcher_name"] == f"Researcher {(i % 10) + 1}"])
+                "works_count": works_per_researcher[f"Researcher {(i % 10) + 1}"]
             }
             for i in range(10)
         ]
@@ -101,10 +110,8 @@ def generate_clustering_results():
     return generator.generate_clustering_results(num_clusters=5, num_points=500)
 
 
-def generate_search_index():
-    """Generate search index data"""
-    viz_data = generate_visualization_data()
-    
+def generate_search_index(viz_data):
+    """Generate search index data from already generated visualization data"""
     search_index = []
     for work in viz_data["works"]:
         search_index.append({
@@ -134,33 +141,39 @@ def convert_numpy_types(obj):
         return obj
 
 
-def write_json_file(data, filepath):
-    """Write JSON data to file"""
-    # Convert numpy types to native Python types
-    serializable_data = convert_numpy_types(data)
-    
-    with open(filepath, 'w') as f:
-        json.dump(serializable_data, f, indent=2)
+def write_and_compress(data, filepath):
+    """Write JSON data to file and its gzip copy from a single serialization"""
+    if orjson is not None:
+        # orjson encodes numpy arrays and scalars natively
+        data_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        # Convert numpy types to native Python types
+        serializable_data = convert_numpy_types(data)
+        data_bytes = json.dumps(serializable_data, indent=2).encode('utf-8')
     
-    file_size = Path(filepath).stat().st_size
-    print(f"✅ Generated {filepath} ({file_size:,} bytes)")
-    return file_size
-
-
-def compress_file(filepath):
-    """Compress JSON file with gzip"""
+    # Fastest deflate level: CI only checks the ratio stays under 0.8
     compressed_path = f"{filepath}.gz"
+    with open(filepath, 'wb') as f_raw, gzip.open(compressed_path, 'wb', compresslevel=1) as f_gz:
+        f_raw.write(data_bytes)
+        f_gz.write(data_bytes)
     
-    with open(filepath, 'rb') as f_in:
-        with gzip.open(compressed_path, 'wb') as f_out:
-            f_out.writelines(f_in)
+    file_size = len(data_bytes)
+    print(f"✅ Generated {filepath} ({file_size:,} bytes)")
     
-    original_size = Path(filepath).stat().st_size
     compressed_size = Path(compressed_path).stat().st_size
-    ratio = compressed_size / original_size
-    
+    ratio = compressed_size / file_size
     print(f"✅ Compressed {filepath}.gz (ratio: {ratio:.3f})")
-    return compressed_size, ratio
+    
+    return file_size, compressed_size
+
+
+def link_or_copy(source, target):
+    """Hardlink target to source, copying instead where links are unsupported"""
+    Path(target).unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except (OSError, AttributeError):
+        shutil.copy2(source, target)
 
 
 def main():
@@ -181,7 +194,7 @@ def main():
     clustering_results = generate_clustering_results()
     
     print("🔎 Generating search index...")
-    search_index = generate_search_index()
+    search_index = generate_search_index(viz_data)
     
     # File paths for data
     files_to_generate = [
@@ -199,13 +212,20 @@ def main():
     total_uncompressed = 0
     total_compressed = 0
     
+    # Serialize each payload once; later paths for the same payload link to the first
+    written = {}
     for filepath, data in files_to_generate:
-        # Write JSON file
-        file_size = write_json_file(data, filepath)
-        total_uncompressed += file_size
+        if id(data) in written:
+            source, file_size, compressed_size = written[id(data)]
+            link_or_copy(source, filepath)
+            link_or_copy(f"{source}.gz", f"{filepath}.gz")
+            print(f"✅ Linked {filepath}(.gz) -> {source}")
+        else:
+            # Write JSON file and its compressed copy
+            file_size, compressed_size = write_and_compress(data, filepath)
+            written[id(data)] = (filepath, file_size, compressed_size)
         
-        # Compress file
-        compressed_size, ratio = compress_file(filepath)
+        total_uncompressed += file_size
         total_compressed += compressed_size
     
     # Summary
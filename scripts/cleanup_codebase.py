@@ -12,6 +12,14 @@ import json
 from pathlib import Path
 
 
+def move_file(src, dst):
+    """Rename src to dst in one step, copying only when they are on different filesystems"""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
+
+
 def backup_current_state():
     """Create a backup of current state before cleanup"""
     print("📦 Creating backup of current state...")
@@ -35,6 +43,8 @@ def backup_current_state():
         if src.exists():
             dst = backup_dir / dir_path
             dst.parent.mkdir(parents=True, exist_ok=True)
+            # Full copies, not hardlinks: a linked backup shares its inode with
+            # the original, so any in-place write to it would alter the backup too
             shutil.copytree(src, dst)
             print(f"   ✅ Backed up {dir_path}")
     
@@ -66,7 +76,7 @@ def move_unique_files():
         src = Path(file_path)
         if src.exists():
             dst = processed_dir / src.name
-            shutil.move(str(src), str(dst))
+            move_file(src, dst)
             print(f"   ✅ Moved {src} → {dst}")
         else:
             print(f"   ⚠️  File not found: {src}")
@@ -81,7 +91,7 @@ def move_unique_files():
         src = Path(file_path)
         if src.exists():
             dst = processed_dir / src.name
-            shutil.move(str(src), str(dst))
+            move_file(src, dst)
             print(f"   ✅ Moved backup {src} → {dst}")
 
 
@@ -99,18 +109,29 @@ def consolidate_models():
     
     for source_dir in model_sources:
         src_path = Path(source_dir)
-        if src_path.exists():
-            for model_file in src_path.glob("*.pkl"):
-                dst = models_dir / model_file.name
-                if not dst.exists():
-                    shutil.move(str(model_file), str(dst))
+        if not src_path.exists():
+            continue
+        
+        # scandir entries carry their type and cache their stat result
+        with os.scandir(src_path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".pkl") or entry.name.startswith(".") or not entry.is_file():
+                    continue
+                
+                model_file = src_path / entry.name
+                dst = models_dir / entry.name
+                try:
+                    dst_mtime = dst.stat().st_mtime
+                except FileNotFoundError:
+                    move_file(model_file, dst)
                     print(f"   ✅ Moved {model_file} → {dst}")
-                else:
-                    print(f"   ⚠️  Model already exists: {dst}")
-                    # Keep the newer file
-                    if model_file.stat().st_mtime > dst.stat().st_mtime:
-                        shutil.move(str(model_file), str(dst))
-                        print(f"   ✅ Updated with newer version: {dst}")
+                    continue
+                
+                print(f"   ⚠️  Model already exists: {dst}")
+                # Keep the newer file
+                if entry.stat().st_mtime > dst_mtime:
+                    move_file(model_file, dst)
+                    print(f"   ✅ Updated with newer version: {dst}")
 
 
 def remove_duplicate_directories():
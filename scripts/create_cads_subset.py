@@ -5,11 +5,18 @@ This script reads professor names from cads.txt and creates cads_researchers and
 with data for only those researchers whose names match the list.
 """
 import os
+import csv
 import sys
 import logging
+from collections import namedtuple
 from typing import List, Dict, Tuple, Optional
 from dotenv import load_dotenv
 
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:
+    fuzz = process = fuzz_utils = None
+
 # Add the app directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -30,6 +37,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Matched researcher: just what the copy and the log lines need
+Researcher = namedtuple('Researcher', 'id full_name')
+
+# Minimum RapidFuzz token_set_ratio for a candidate to count as the professor
+NAME_MATCH_SCORE_CUTOFF = 85
+
 
 class CADSSubsetCreator:
     """Creates CADS subset tables and populates them with matching data."""
@@ -48,6 +61,22 @@ class CADSSubsetCreator:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
+    def configure_session(self):
+        """Tune the session for a one-off bulk load that can simply be re-run."""
+        try:
+            # Commits don't wait for WAL flush; a crash loses at most the
+            # last commits, which re-running the idempotent load restores
+            session_query = """
+            SET synchronous_commit = off;
+            SET work_mem = '256MB';
+            SET maintenance_work_mem = '512MB';
+            """
+            self.db_manager.execute_query(session_query)
+            logger.info("Configured session for bulk loading")
+        except Exception as e:
+            logger.error(f"Failed to configure database session: {e}")
+            raise
+    
     def read_cads_professors(self, file_path: str = "cads.txt") -> List[Tuple[str, str]]:
         """
         Read CADS professors from the text file.
@@ -58,21 +87,15 @@ class CADSSubsetCreator:
         Returns:
             List of (surname, name) tuples
         """
-        professors = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
+            with open(file_path, 'r', encoding='utf-8', newline='') as file:
+                reader = csv.reader(file, delimiter='\t', quoting=csv.QUOTE_NONE)
                 
-            # Skip the header line
-            for line in lines[1:]:
-                line = line.strip()
-                if line and '\t' in line:
-                    parts = line.split('\t')
-                    if len(parts) >= 2:
-                        surname = parts[0].strip()
-                        name = parts[1].strip()
-                        professors.append((surname, name))
+                # Skip the header line
+                next(reader, None)
+                rows = ((row[0].strip(), row[1].strip()) for row in reader if len(row) >= 2)
+                # Both parts are needed: a bare surname scores 100 against any "X Surname"
+                professors = [(surname, name) for surname, name in rows if surname and name]
                         
             logger.info(f"Read {len(professors)} CADS professors from {file_path}")
             return professors
@@ -82,13 +105,20 @@ class CADSSubsetCreator:
             raise
     
     def create_cads_tables(self):
-        """Create CADS subset tables with the same schema as original tables."""
+        """
+        Create CADS subset tables with the same schema as original tables.
+        
+        Only keys, constraints and triggers are created here; secondary indexes
+        are built by create_cads_indexes() once the tables are populated.
+        New tables start UNLOGGED to skip per-row WAL during the copy and are
+        made durable by set_cads_tables_logged().
+        """
         try:
             logger.info("Creating CADS subset tables...")
             
             # Create cads_researchers table
             create_cads_researchers_query = """
-            CREATE TABLE IF NOT EXISTS cads_researchers (
+            CREATE UNLOGGED TABLE IF NOT EXISTS cads_researchers (
                 id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
                 institution_id UUID NOT NULL REFERENCES institutions(id) ON DELETE CASCADE,
                 openalex_id TEXT UNIQUE NOT NULL,
@@ -99,29 +129,16 @@ class CADSSubsetCreator:
                 updated_at TIMESTAMPTZ DEFAULT now()
             );
             
-            -- Create indexes for cads_researchers
-            CREATE INDEX IF NOT EXISTS idx_cads_researchers_openalex_id ON cads_researchers(openalex_id);
-            CREATE INDEX IF NOT EXISTS idx_cads_researchers_institution_id ON cads_researchers(institution_id);
-            CREATE INDEX IF NOT EXISTS idx_cads_researchers_full_name ON cads_researchers(full_name);
-            CREATE INDEX IF NOT EXISTS idx_cads_researchers_h_index ON cads_researchers(h_index);
-            
-            -- Create trigger for updated_at
-            DO $$
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_cads_researchers_updated_at') THEN
-                    CREATE TRIGGER update_cads_researchers_updated_at 
-                    BEFORE UPDATE ON cads_researchers 
-                    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-                END IF;
-            END $$;
+            -- Create trigger for updated_at (idempotent, PostgreSQL 14+)
+            CREATE OR REPLACE TRIGGER update_cads_researchers_updated_at
+            BEFORE UPDATE ON cads_researchers
+            FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
             """
             
-            self.db_manager.execute_query(create_cads_researchers_query)
-            logger.info("Created cads_researchers table")
-            
-            # Create cads_works table
+            # Create cads_works table; constraints are declared inline since
+            # ALTER TABLE ... ADD CONSTRAINT has no IF NOT EXISTS form
             create_cads_works_query = """
-            CREATE TABLE IF NOT EXISTS cads_works (
+            CREATE UNLOGGED TABLE IF NOT EXISTS cads_works (
                 id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
                 researcher_id UUID NOT NULL REFERENCES cads_researchers(id) ON DELETE CASCADE,
                 openalex_id TEXT UNIQUE NOT NULL,
@@ -133,70 +150,102 @@ class CADSSubsetCreator:
                 citations INTEGER DEFAULT 0,
                 embedding VECTOR(384),
                 created_at TIMESTAMPTZ DEFAULT now(),
-                updated_at TIMESTAMPTZ DEFAULT now()
+                updated_at TIMESTAMPTZ DEFAULT now(),
+                CONSTRAINT chk_cads_works_publication_year_valid
+                    CHECK (publication_year >= 1900 AND publication_year <= EXTRACT(YEAR FROM CURRENT_DATE) + 1),
+                CONSTRAINT chk_cads_works_citations_positive
+                    CHECK (citations >= 0)
             );
             
-            -- Create indexes for cads_works
-            CREATE INDEX IF NOT EXISTS idx_cads_works_openalex_id ON cads_works(openalex_id);
-            CREATE INDEX IF NOT EXISTS idx_cads_works_researcher_id ON cads_works(researcher_id);
-            CREATE INDEX IF NOT EXISTS idx_cads_works_publication_year ON cads_works(publication_year);
-            CREATE INDEX IF NOT EXISTS idx_cads_works_citations ON cads_works(citations);
-            CREATE INDEX IF NOT EXISTS idx_cads_works_title ON cads_works USING gin(to_tsvector('english', title));
-            CREATE INDEX IF NOT EXISTS idx_cads_works_abstract ON cads_works USING gin(to_tsvector('english', abstract));
-            
-            -- Vector similarity index for embeddings
-            CREATE INDEX IF NOT EXISTS idx_cads_works_embedding ON cads_works USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
-            
-            -- Create trigger for updated_at
-            DO $$
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_cads_works_updated_at') THEN
-                    CREATE TRIGGER update_cads_works_updated_at 
-                    BEFORE UPDATE ON cads_works 
-                    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-                END IF;
-            END $$;
-            
-            -- Add constraints
-            ALTER TABLE cads_works ADD CONSTRAINT IF NOT EXISTS chk_cads_works_publication_year_valid 
-            CHECK (publication_year >= 1900 AND publication_year <= EXTRACT(YEAR FROM CURRENT_DATE) + 1);
-            ALTER TABLE cads_works ADD CONSTRAINT IF NOT EXISTS chk_cads_works_citations_positive 
-            CHECK (citations >= 0);
+            -- Create trigger for updated_at (idempotent, PostgreSQL 14+)
+            CREATE OR REPLACE TRIGGER update_cads_works_updated_at
+            BEFORE UPDATE ON cads_works
+            FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
             """
             
-            self.db_manager.execute_query(create_cads_works_query)
-            logger.info("Created cads_works table")
-            
             # Create cads_topics table
             create_cads_topics_query = """
-            CREATE TABLE IF NOT EXISTS cads_topics (
+            CREATE UNLOGGED TABLE IF NOT EXISTS cads_topics (
                 id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
                 work_id UUID NOT NULL REFERENCES cads_works(id) ON DELETE CASCADE,
                 name TEXT NOT NULL,
                 type TEXT NOT NULL,
                 score FLOAT8,
-                created_at TIMESTAMPTZ DEFAULT now()
+                created_at TIMESTAMPTZ DEFAULT now(),
+                CONSTRAINT chk_cads_topics_score_range
+                    CHECK (score >= 0.0 AND score <= 1.0)
             );
+            """
+            
+            # Send all table DDL in one round-trip; it runs as one transaction,
+            # so a failure leaves none of the tables half-created
+            self.db_manager.execute_query(
+                create_cads_researchers_query + create_cads_works_query + create_cads_topics_query
+            )
+            logger.info("Created cads_researchers, cads_works and cads_topics tables")
+            
+        except Exception as e:
+            logger.error(f"Error creating CADS tables: {e}")
+            raise
+    
+    def set_cads_tables_logged(self):
+        """Make the CADS subset tables crash-safe (WAL-logged) again after loading."""
+        try:
+            # Referenced tables first: a logged table may not reference an unlogged one
+            set_logged_query = """
+            ALTER TABLE cads_researchers SET LOGGED;
+            ALTER TABLE cads_works SET LOGGED;
+            ALTER TABLE cads_topics SET LOGGED;
+            """
+            self.db_manager.execute_query(set_logged_query)
+            logger.info("Set CADS subset tables to LOGGED")
+        except Exception as e:
+            logger.error(f"Error setting CADS tables to LOGGED: {e}")
+            raise
+    
+    def create_cads_indexes(self):
+        """
+        Create secondary indexes on the CADS subset tables.
+        
+        Run after the tables are populated so rows are not indexed one at a
+        time during the copy and the IVFFlat lists are trained on real vectors.
+        """
+        try:
+            logger.info("Creating CADS subset indexes...")
+            
+            create_cads_indexes_query = """
+            -- Indexes for cads_researchers
+            CREATE INDEX IF NOT EXISTS idx_cads_researchers_openalex_id ON cads_researchers(openalex_id);
+            CREATE INDEX IF NOT EXISTS idx_cads_researchers_institution_id ON cads_researchers(institution_id);
+            CREATE INDEX IF NOT EXISTS idx_cads_researchers_full_name ON cads_researchers(full_name);
+            CREATE INDEX IF NOT EXISTS idx_cads_researchers_h_index ON cads_researchers(h_index);
+            
+            -- Indexes for cads_works
+            CREATE INDEX IF NOT EXISTS idx_cads_works_openalex_id ON cads_works(openalex_id);
+            CREATE INDEX IF NOT EXISTS idx_cads_works_researcher_id ON cads_works(researcher_id);
+            CREATE INDEX IF NOT EXISTS idx_cads_works_publication_year ON cads_works(publication_year);
+            CREATE INDEX IF NOT EXISTS idx_cads_works_citations ON cads_works(citations);
+            CREATE INDEX IF NOT EXISTS idx_cads_works_title ON cads_works USING gin(to_tsvector('english', title));
+            CREATE INDEX IF NOT EXISTS idx_cads_works_abstract ON cads_works USING gin(to_tsvector('english', abstract));
+            
+            -- Vector similarity index for embeddings
+            CREATE INDEX IF NOT EXISTS idx_cads_works_embedding ON cads_works USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
             
-            -- Create indexes for cads_topics
+            -- Indexes for cads_topics
             CREATE INDEX IF NOT EXISTS idx_cads_topics_work_id ON cads_topics(work_id);
             CREATE INDEX IF NOT EXISTS idx_cads_topics_name ON cads_topics(name);
             CREATE INDEX IF NOT EXISTS idx_cads_topics_type ON cads_topics(type);
             CREATE INDEX IF NOT EXISTS idx_cads_topics_score ON cads_topics(score);
-            
-            -- Add constraint
-            ALTER TABLE cads_topics ADD CONSTRAINT IF NOT EXISTS chk_cads_topics_score_range 
-            CHECK (score >= 0.0 AND score <= 1.0);
             """
             
-            self.db_manager.execute_query(create_cads_topics_query)
-            logger.info("Created cads_topics table")
+            self.db_manager.execute_query(create_cads_indexes_query)
+            logger.info("Created CADS subset indexes")
             
         except Exception as e:
-            logger.error(f"Error creating CADS tables: {e}")
+            logger.error(f"Error creating CADS indexes: {e}")
             raise
     
-    def find_matching_researchers(self, professors: List[Tuple[str, str]]) -> List[Dict]:
+    def find_matching_researchers(self, professors: List[Tuple[str, str]]) -> List[Researcher]:
         """
         Find researchers in the database that match the CADS professor names.
         
@@ -204,59 +253,51 @@ class CADSSubsetCreator:
             professors: List of (surname, name) tuples
             
         Returns:
-            List of matching researcher records
+            List of matching Researcher tuples
         """
         matching_researchers = []
         
         try:
             logger.info(f"Searching for {len(professors)} CADS professors in the database...")
             
-            for surname, name in professors:
-                # Try different name matching strategies
-                search_patterns = [
-                    f"{name} {surname}",  # "John Smith"
-                    f"{surname}, {name}",  # "Smith, John"
-                    f"{surname} {name}",  # "Smith John"
-                    f"{name.split()[0]} {surname}" if ' ' in name else f"{name} {surname}",  # First name only
-                ]
-                
-                found = False
-                for pattern in search_patterns:
-                    if found:
-                        break
-                        
-                    # Search for researchers with similar names
-                    search_query = """
-                    SELECT * FROM researchers 
-                    WHERE LOWER(full_name) LIKE LOWER(%s)
-                    OR LOWER(full_name) LIKE LOWER(%s)
-                    OR LOWER(full_name) LIKE LOWER(%s);
-                    """
-                    
-                    like_patterns = [
-                        f"%{pattern}%",
-                        f"%{name}%{surname}%",
-                        f"%{surname}%{name}%"
-                    ]
-                    
-                    results = self.db_manager.execute_query(
-                        search_query, 
-                        tuple(like_patterns), 
-                        fetch=True
-                    )
-                    
-                    if results:
-                        for result in results:
-                            # Additional validation to avoid false positives
-                            full_name = result['full_name'].lower()
-                            if (name.lower() in full_name and surname.lower() in full_name):
-                                matching_researchers.append(dict(result))
-                                logger.info(f"Found match: {result['full_name']} for {name} {surname}")
-                                found = True
-                                break
-                
-                if not found:
+            # Trigram index so the similarity matches below don't scan researchers
+            trigram_index_query = """
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_researchers_full_name_trgm
+            ON researchers USING gin (LOWER(full_name) gin_trgm_ops);
+            """
+            self.db_manager.execute_query(trigram_index_query)
+            
+            # Fetch candidates for every professor in one round-trip: researchers
+            # whose name is trigram-similar to the full name, closest first. Only
+            # the % operator is used: a LIKE on a 2-letter surname such as 'Ng'
+            # has no trigrams for the index and matches far too many names
+            search_query = """
+            SELECT p.professor_index, r.id, r.full_name
+            FROM unnest(%s::text[], %s::text[]) WITH ORDINALITY AS p(surname, name, professor_index)
+            JOIN researchers r
+              ON LOWER(r.full_name) %% LOWER(p.name || ' ' || p.surname)
+            ORDER BY p.professor_index,
+                     similarity(LOWER(r.full_name), LOWER(p.name || ' ' || p.surname)) DESC;
+            """
+            
+            surnames = [surname for surname, _ in professors]
+            names = [name for _, name in professors]
+            results = self.db_manager.execute_query(search_query, (surnames, names), fetch=True)
+            
+            candidates = {}
+            for result in results or []:
+                candidates.setdefault(result['professor_index'], []).append(
+                    Researcher(result['id'], result['full_name'])
+                )
+            
+            for index, (surname, name) in enumerate(professors, 1):
+                researcher = self.pick_researcher(name, surname, candidates.get(index, []))
+                if researcher is None:
                     logger.warning(f"No match found for: {name} {surname}")
+                    continue
+                matching_researchers.append(researcher)
+                logger.info(f"Found match: {researcher.full_name} for {name} {surname}")
             
             logger.info(f"Found {len(matching_researchers)} matching researchers")
             return matching_researchers
@@ -265,12 +306,44 @@ class CADSSubsetCreator:
             logger.error(f"Error finding matching researchers: {e}")
             raise
     
-    def copy_researcher_data(self, researchers: List[Dict]) -> Dict[str, str]:
+    def pick_researcher(self, name: str, surname: str, candidates: List[Researcher]) -> Optional[Researcher]:
+        """
+        Pick the candidate researcher that best matches a professor's name.
+        
+        Args:
+            name: Professor's given name(s)
+            surname: Professor's surname
+            candidates: Candidate Researcher tuples, closest trigram match first
+            
+        Returns:
+            The matching Researcher, or None if no candidate is close enough
+        """
+        if not candidates:
+            return None
+        
+        if process is not None:
+            best = process.extractOne(
+                f"{name} {surname}",
+                [candidate.full_name for candidate in candidates],
+                scorer=fuzz.token_set_ratio,
+                processor=fuzz_utils.default_process,
+                score_cutoff=NAME_MATCH_SCORE_CUTOFF
+            )
+            return candidates[best[2]] if best else None
+        
+        # Without RapidFuzz, require both name parts to appear in the full name
+        for candidate in candidates:
+            full_name = candidate.full_name.lower()
+            if name.lower() in full_name and surname.lower() in full_name:
+                return candidate
+        return None
+    
+    def copy_researcher_data(self, researchers: List[Researcher]) -> Dict[str, str]:
         """
         Copy matching researchers to cads_researchers table.
         
         Args:
-            researchers: List of researcher records to copy
+            researchers: List of Researcher tuples to copy
             
         Returns:
             Dictionary mapping original researcher IDs to new CADS researcher IDs
@@ -280,33 +353,30 @@ class CADSSubsetCreator:
         try:
             logger.info(f"Copying {len(researchers)} researchers to cads_researchers table...")
             
-            for researcher in researchers:
-                # Insert into cads_researchers table
-                insert_query = """
-                INSERT INTO cads_researchers (institution_id, openalex_id, full_name, h_index, department)
-                VALUES (%(institution_id)s, %(openalex_id)s, %(full_name)s, %(h_index)s, %(department)s)
-                ON CONFLICT (openalex_id) DO NOTHING
-                RETURNING id;
-                """
-                
-                result = self.db_manager.execute_query(insert_query, researcher, fetch=True)
-                
-                if result:
-                    new_id = result[0]['id']
-                    id_mapping[str(researcher['id'])] = str(new_id)
-                    logger.debug(f"Copied researcher: {researcher['full_name']} (ID: {new_id})")
-                else:
-                    # Handle conflict case - get existing ID
-                    existing_query = "SELECT id FROM cads_researchers WHERE openalex_id = %s;"
-                    existing_result = self.db_manager.execute_query(
-                        existing_query, 
-                        (researcher['openalex_id'],), 
-                        fetch=True
-                    )
-                    if existing_result:
-                        existing_id = existing_result[0]['id']
-                        id_mapping[str(researcher['id'])] = str(existing_id)
-                        logger.debug(f"Researcher already exists: {researcher['full_name']} (ID: {existing_id})")
+            original_ids = [str(researcher.id) for researcher in researchers]
+            
+            # Copy all matched rows server-side in one statement; the rows never
+            # travel through Python and existing researchers are left untouched
+            insert_query = """
+            INSERT INTO cads_researchers (institution_id, openalex_id, full_name, h_index, department)
+            SELECT institution_id, openalex_id, full_name, h_index, department
+            FROM researchers
+            WHERE id = ANY(%s::uuid[])
+            ON CONFLICT (openalex_id) DO NOTHING;
+            """
+            self.db_manager.execute_query(insert_query, (original_ids,))
+            
+            # Resolve new and pre-existing CADS ids in a single lookup
+            mapping_query = """
+            SELECT r.id AS original_id, c.id AS cads_id
+            FROM researchers r
+            JOIN cads_researchers c ON c.openalex_id = r.openalex_id
+            WHERE r.id = ANY(%s::uuid[]);
+            """
+            results = self.db_manager.execute_query(mapping_query, (original_ids,), fetch=True)
+            
+            for result in results or []:
+                id_mapping[str(result['original_id'])] = str(result['cads_id'])
             
             logger.info(f"Successfully copied {len(id_mapping)} researchers")
             return id_mapping
@@ -325,55 +395,49 @@ class CADSSubsetCreator:
         try:
             logger.info("Copying works for CADS researchers...")
             
-            total_works = 0
-            total_topics = 0
+            original_ids = list(researcher_id_mapping.keys())
+            cads_ids = list(researcher_id_mapping.values())
+            
+            # Copy works and their topics server-side in a single statement. The
+            # id mapping is joined in as an unnested array pair; each openalex_id
+            # is taken from one source work, and topics are copied only for works
+            # that were newly inserted (existing works keep their topics)
+            copy_query = """
+            WITH researcher_id_map AS (
+                SELECT original_id, cads_id FROM unnest(%s::uuid[], %s::uuid[]) AS m(original_id, cads_id)
+            ),
+            source_works AS (
+                SELECT DISTINCT ON (w.openalex_id)
+                       w.id AS original_work_id, m.cads_id, w.openalex_id, w.title, w.abstract,
+                       w.keywords, w.publication_year, w.doi, w.citations, w.embedding
+                FROM works w
+                JOIN researcher_id_map m ON w.researcher_id = m.original_id
+                ORDER BY w.openalex_id, w.id
+            ),
+            new_works AS (
+                INSERT INTO cads_works (researcher_id, openalex_id, title, abstract, keywords,
+                                        publication_year, doi, citations, embedding)
+                SELECT cads_id, openalex_id, title, abstract, keywords,
+                       publication_year, doi, citations, embedding
+                FROM source_works
+                ON CONFLICT (openalex_id) DO NOTHING
+                RETURNING id, openalex_id
+            ),
+            new_topics AS (
+                INSERT INTO cads_topics (work_id, name, type, score)
+                SELECT nw.id, t.name, t.type, t.score
+                FROM new_works nw
+                JOIN source_works sw ON sw.openalex_id = nw.openalex_id
+                JOIN topics t ON t.work_id = sw.original_work_id
+                RETURNING id
+            )
+            SELECT (SELECT COUNT(*) FROM new_works) AS works_count,
+                   (SELECT COUNT(*) FROM new_topics) AS topics_count;
+            """
             
-            for original_id, cads_id in researcher_id_mapping.items():
-                # Get all works for this researcher
-                works_query = "SELECT * FROM works WHERE researcher_id = %s;"
-                works = self.db_manager.execute_query(works_query, (original_id,), fetch=True)
-                
-                if works:
-                    logger.info(f"Copying {len(works)} works for researcher {cads_id}")
-                    
-                    for work in works:
-                        # Insert work into cads_works table
-                        work_data = dict(work)
-                        work_data['researcher_id'] = cads_id  # Update to CADS researcher ID
-                        original_work_id = work_data.pop('id')  # Remove original ID
-                        
-                        insert_work_query = """
-                        INSERT INTO cads_works (researcher_id, openalex_id, title, abstract, keywords, 
-                                              publication_year, doi, citations, embedding)
-                        VALUES (%(researcher_id)s, %(openalex_id)s, %(title)s, %(abstract)s, %(keywords)s,
-                                %(publication_year)s, %(doi)s, %(citations)s, %(embedding)s)
-                        ON CONFLICT (openalex_id) DO NOTHING
-                        RETURNING id;
-                        """
-                        
-                        work_result = self.db_manager.execute_query(insert_work_query, work_data, fetch=True)
-                        
-                        if work_result:
-                            new_work_id = work_result[0]['id']
-                            total_works += 1
-                            
-                            # Copy topics for this work
-                            topics_query = "SELECT * FROM topics WHERE work_id = %s;"
-                            topics = self.db_manager.execute_query(topics_query, (original_work_id,), fetch=True)
-                            
-                            if topics:
-                                for topic in topics:
-                                    topic_data = dict(topic)
-                                    topic_data['work_id'] = new_work_id  # Update to CADS work ID
-                                    topic_data.pop('id')  # Remove original ID
-                                    
-                                    insert_topic_query = """
-                                    INSERT INTO cads_topics (work_id, name, type, score)
-                                    VALUES (%(work_id)s, %(name)s, %(type)s, %(score)s);
-                                    """
-                                    
-                                    self.db_manager.execute_query(insert_topic_query, topic_data)
-                                    total_topics += 1
+            result = self.db_manager.execute_query(copy_query, (original_ids, cads_ids), fetch=True)
+            total_works = result[0]['works_count'] if result else 0
+            total_topics = result[0]['topics_count'] if result else 0
             
             logger.info(f"Successfully copied {total_works} works and {total_topics} topics")
             
@@ -386,28 +450,27 @@ class CADSSubsetCreator:
         try:
             logger.info("Generating CADS subset report...")
             
-            # Get statistics
-            researchers_count_query = "SELECT COUNT(*) as count FROM cads_researchers;"
-            researchers_count = self.db_manager.execute_query(researchers_count_query, fetch=True)[0]['count']
-            
-            works_count_query = "SELECT COUNT(*) as count FROM cads_works;"
-            works_count = self.db_manager.execute_query(works_count_query, fetch=True)[0]['count']
-            
-            topics_count_query = "SELECT COUNT(*) as count FROM cads_topics;"
-            topics_count = self.db_manager.execute_query(topics_count_query, fetch=True)[0]['count']
-            
-            # Get average works per researcher
-            avg_works_query = """
-            SELECT AVG(work_count) as avg_works
-            FROM (
-                SELECT COUNT(w.id) as work_count
-                FROM cads_researchers r
-                LEFT JOIN cads_works w ON r.id = w.researcher_id
-                GROUP BY r.id
-            ) subq;
+            # Get statistics in a single round-trip
+            stats_query = """
+            SELECT
+                (SELECT COUNT(*) FROM cads_researchers) AS researchers_count,
+                (SELECT COUNT(*) FROM cads_works) AS works_count,
+                (SELECT COUNT(*) FROM cads_topics) AS topics_count,
+                (
+                    SELECT AVG(work_count)
+                    FROM (
+                        SELECT COUNT(w.id) AS work_count
+                        FROM cads_researchers r
+                        LEFT JOIN cads_works w ON r.id = w.researcher_id
+                        GROUP BY r.id
+                    ) subq
+                ) AS avg_works;
             """
-            avg_works_result = self.db_manager.execute_query(avg_works_query, fetch=True)
-            avg_works = float(avg_works_result[0]['avg_works'] or 0)
+            stats = self.db_manager.execute_query(stats_query, fetch=True)[0]
+            researchers_count = stats['researchers_count']
+            works_count = stats['works_count']
+            topics_count = stats['topics_count']
+            avg_works = float(stats['avg_works'] or 0)
             
             # Print report
             print("\n" + "="*60)
@@ -440,6 +503,7 @@ class CADSSubsetCreator:
             
             # Connect to database
             self.connect_database()
+            self.configure_session()
             
             # Read CADS professors
             professors = self.read_cads_professors()
@@ -452,6 +516,7 @@ class CADSSubsetCreator:
             
             if not matching_researchers:
                 logger.warning("No matching researchers found. Exiting.")
+                self.set_cads_tables_logged()
                 return
             
             # Copy researcher data
@@ -460,6 +525,12 @@ class CADSSubsetCreator:
             # Copy works data
             self.copy_works_data(id_mapping)
             
+            # Make the loaded tables durable, then index them
+            self.set_cads_tables_logged()
+            
+            # Build secondary indexes over the loaded data
+            self.create_cads_indexes()
+            
             # Generate report
             self.generate_report()
             
@@ -5,7 +5,8 @@ Execute CADS migration using direct SQL execution.
 import os
 import sys
 import logging
-import subprocess
+from pathlib import Path
+import psycopg2
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,46 +25,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class NoticeLogger:
+    """Stand-in for connection.notices that logs each server notice as it arrives."""
+    
+    def append(self, notice):
+        logger.info(notice.strip())
+
+
 def execute_sql_file(sql_file_path: str):
-    """Execute SQL file using psql command."""
+    """Execute SQL file over a single psycopg2 connection."""
+    connection = None
     try:
         database_url = os.getenv('DATABASE_URL')
         if not database_url:
             raise ValueError("DATABASE_URL not found in environment variables")
         
-        logger.info(f"Executing SQL file: {sql_file_path}")
+        logger.info("Executing SQL file: %s", sql_file_path)
         
-        # Use psql to execute the SQL file
-        cmd = ['psql', database_url, '-f', sql_file_path, '-v', 'ON_ERROR_STOP=1']
+        connection = psycopg2.connect(database_url)
+        # The script issues its own BEGIN/COMMIT; without them the server still
+        # runs a multi-statement query as one implicit transaction
+        connection.autocommit = True
+        connection.notices = NoticeLogger()
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        with connection.cursor() as cursor:
+            cursor.execute(Path(sql_file_path).read_text(encoding='utf-8'))
+            rows = cursor.fetchall() if cursor.description else []
+            columns = [column.name for column in cursor.description or []]
         
-        if result.returncode == 0:
-            logger.info("SQL execution completed successfully")
-            print("✅ CADS migration completed successfully!")
+        logger.info("SQL execution completed successfully")
+        print("✅ CADS migration completed successfully!")
+        if rows:
             print("\n📊 Output:")
-            print(result.stdout)
-            return True
-        else:
-            logger.error(f"SQL execution failed with return code: {result.returncode}")
-            print("❌ CADS migration failed!")
-            print("\n🔍 Error output:")
-            print(result.stderr)
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error("SQL execution timed out")
-        print("⏰ SQL execution timed out after 5 minutes")
+            for row in rows:
+                print(", ".join(f"{column}: {value}" for column, value in zip(columns, row)))
+        return True
+        
+    except psycopg2.Error as e:
+        logger.error("SQL execution failed: %s", e)
+        print("❌ CADS migration failed!")
+        print("\n🔍 Error output:")
+        print(e)
         return False
     except Exception as e:
-        logger.error(f"Error executing SQL: {e}")
+        logger.error("Error executing SQL: %s", e)
         print(f"❌ Error: {e}")
         return False
+    finally:
+        if connection is not None:
+            connection.close()
 
 
 def main():
@@ -93,7 +103,7 @@ def main():
         return success
         
     except Exception as e:
-        logger.error(f"Migration execution failed: {e}")
+        logger.error("Migration execution failed: %s", e)
         print(f"❌ Migration failed: {e}")
         return False
 
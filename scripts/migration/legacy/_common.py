@@ -0,0 +1,123 @@
+"""
+Helpers shared by the legacy CADS migration runners.
+
+Connection URL parsing, host resolution and reading/splitting the generated
+create_cads_tables.sql script. The runners configure logging themselves.
+"""
+import os
+import re
+import logging
+import mmap
+import socket
+import urllib.parse
+from collections import namedtuple
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import sqlparse
+except ImportError:
+    sqlparse = None
+
+logger = logging.getLogger(__name__)
+
+# Used when sqlparse is not installed: a statement-ending semicolon, or a span
+# whose semicolons don't end one (quoted text, comments, $tag$ ... $tag$ bodies)
+_SQL_TOKEN_RE = re.compile(
+    r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|--[^\n]*|/\*.*?\*/|(\$(?:[A-Za-z_]\w*)?\$).*?\1|;""",
+    re.DOTALL
+)
+
+# Comment lines ahead of a statement's first keyword
+_LEADING_COMMENTS_RE = re.compile(r'^(?:\s*--[^\n]*(?:\n|$))*\s*')
+
+# BEGIN/COMMIT/ROLLBACK in the script itself; the runner owns the transaction
+TRANSACTION_CONTROL_RE = re.compile(r'(BEGIN|START\s+TRANSACTION|COMMIT|END|ROLLBACK)\b\s*;?\s*$', re.IGNORECASE)
+
+# Connection fields of a postgresql:// URL
+DatabaseURL = namedtuple('DatabaseURL', 'user password host port dbname')
+
+
+def normalize_database_url(database_url: str) -> str:
+    """Accept SQLAlchemy-style postgresql+psycopg:// URLs as plain libpq URLs."""
+    return re.sub(r'^postgres(?:ql)?\+\w+://', 'postgresql://', database_url)
+
+
+@lru_cache(maxsize=None)
+def parse_db_url(url: str) -> DatabaseURL:
+    """
+    Split a postgresql:// URL into its connection fields, once per URL.
+    
+    Returns:
+        DatabaseURL with user and password percent-decoded and port defaulting to 5432
+    """
+    parsed = urllib.parse.urlparse(url)
+    if not parsed.hostname:
+        raise ValueError("Invalid DATABASE_URL format")
+    return DatabaseURL(
+        user=urllib.parse.unquote(parsed.username or ''),
+        password=urllib.parse.unquote(parsed.password or ''),
+        host=parsed.hostname,
+        port=parsed.port or 5432,
+        dbname=parsed.path[1:]
+    )
+
+
+@lru_cache(maxsize=None)
+def resolve_host(host: str, port: int) -> Optional[str]:
+    """
+    Resolve a database host to an IPv4 address once per run.
+    
+    Returns:
+        The first address found, or None to leave resolution to libpq
+    """
+    try:
+        addresses = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        logger.warning(f"Could not resolve {host}: {e}")
+        return None
+    return addresses[0][4][0]
+
+
+def read_sql_file(sql_file: str):
+    """
+    Read a SQL script through a read-only memory map.
+    
+    Returns:
+        (sql_content, size) with size the file length in bytes
+    """
+    with open(sql_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return '', 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Decode straight from the mapping, without an intermediate bytes copy
+            with memoryview(mm) as view:
+                return str(view, 'utf-8'), mm.size()
+
+
+def _split_on_semicolons(sql_content: str) -> List[str]:
+    """Split at semicolons outside quotes, comments and dollar-quoted bodies."""
+    pieces = []
+    start = 0
+    for match in _SQL_TOKEN_RE.finditer(sql_content):
+        if match.group() == ';':
+            pieces.append(sql_content[start:match.end()])
+            start = match.end()
+    pieces.append(sql_content[start:])
+    return pieces
+
+
+def split_sql_statements(sql_content: str) -> List[str]:
+    """
+    Split a SQL script into statements, respecting quoted literals and $$ bodies.
+    
+    Returns:
+        List of statements with leading comment lines removed
+    """
+    if sqlparse is not None:
+        pieces = sqlparse.split(sql_content)
+    else:
+        pieces = _split_on_semicolons(sql_content)
+    
+    statements = (_LEADING_COMMENTS_RE.sub('', piece, count=1).strip() for piece in pieces)
+    return [statement for statement in statements if statement]
@@ -6,9 +6,28 @@ import os
 import sys
 import logging
 import time
-import socket
 from dotenv import load_dotenv
 
+from _common import (
+    TRANSACTION_CONTROL_RE,
+    normalize_database_url,
+    parse_db_url,
+    read_sql_file,
+    resolve_host,
+    split_sql_statements,
+)
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:
+    psycopg = None
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
 # Load environment variables
 load_dotenv()
 
@@ -24,79 +43,82 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# One lazily opened connection pool per SSL mode tried
+_pools = {}
 
-def test_connectivity():
-    """Test various connectivity options."""
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        return False, "DATABASE_URL not found"
-    
-    # Parse the URL
-    import re
-    match = re.match(r'postgresql://([^:]+):([^@]+)@([^:]+):(\d+)/(.+)', database_url)
-    if not match:
-        return False, "Invalid DATABASE_URL format"
-    
-    username, password, host, port, database = match.groups()
-    port = int(port)
-    
-    logger.info(f"Testing connectivity to {host}:{port}")
+
+def get_connection_pool(config):
+    """
+    Open the pool for one connection approach, reusing it if it is already open.
     
-    # Test 1: Socket connection
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10)
-        result = sock.connect_ex((host, port))
-        sock.close()
+    Args:
+        config: Connection approach with dsn, connect_timeout and sslmode
         
-        if result == 0:
-            logger.info("✅ Socket connection successful")
-            return True, "Socket connection works"
-        else:
-            logger.warning(f"❌ Socket connection failed: {result}")
-    except Exception as e:
-        logger.warning(f"❌ Socket test failed: {e}")
-    
-    # Test 2: Try alternative DNS resolution
-    try:
-        import dns.resolver
-        resolver = dns.resolver.Resolver()
-        resolver.nameservers = ['8.8.8.8', '1.1.1.1']  # Use public DNS
-        answers = resolver.resolve(host, 'A')
-        for answer in answers:
-            logger.info(f"DNS resolved {host} to {answer}")
-            return True, f"DNS resolution successful: {answer}"
-    except ImportError:
-        logger.info("dnspython not available for alternative DNS resolution")
-    except Exception as e:
-        logger.warning(f"Alternative DNS resolution failed: {e}")
-    
-    return False, "All connectivity tests failed"
+    Returns:
+        Open ConnectionPool; raises PoolTimeout if no connection could be made
+    """
+    pool = _pools.get(config['sslmode'])
+    if pool is None:
+        conn_params = {
+            'row_factory': dict_row,
+            'prepare_threshold': 5,
+            # Transactions are opened explicitly with conn.transaction()
+            'autocommit': True,
+            'connect_timeout': config['connect_timeout'],
+            'sslmode': config['sslmode']
+        }
+        
+        # Resolve once for every pool; host stays in the DSN for TLS
+        db_url = parse_db_url(config['dsn'])
+        hostaddr = resolve_host(db_url.host, db_url.port)
+        if hostaddr:
+            conn_params['hostaddr'] = hostaddr
+        
+        pool = ConnectionPool(
+            conninfo=config['dsn'],
+            min_size=1,
+            max_size=4,
+            kwargs=conn_params,
+            # The pool retries failed connects with backoff until this timeout
+            reconnect_timeout=config['connect_timeout'] * 2,
+            name=f"cads_migration_{config['sslmode']}",
+            open=False
+        )
+        try:
+            pool.open(wait=True, timeout=config['connect_timeout'] * 2)
+        except Exception:
+            pool.close()
+            raise
+        _pools[config['sslmode']] = pool
+    return pool
+
+
+def close_connection_pools():
+    """Close every pool opened by get_connection_pool."""
+    while _pools:
+        _pools.popitem()[1].close()
 
 
 def execute_migration_with_retry():
     """Execute migration with enhanced retry logic."""
+    if psycopg is None or ConnectionPool is None:
+        logger.error("psycopg not available. Install with: pip install 'psycopg[binary,pool]'")
+        return False, {}
+    
     try:
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
-        
         database_url = os.getenv('DATABASE_URL')
         if not database_url:
             raise ValueError("DATABASE_URL not found")
-        
-        # Test connectivity first
-        connected, message = test_connectivity()
-        logger.info(f"Connectivity test: {message}")
+        database_url = normalize_database_url(database_url)
         
         # Read SQL file
         sql_file = "create_cads_tables.sql"
         if not os.path.exists(sql_file):
             raise FileNotFoundError(f"SQL file not found: {sql_file}")
         
-        with open(sql_file, 'r') as f:
-            sql_content = f.read()
+        sql_content, sql_size = read_sql_file(sql_file)
         
-        logger.info(f"SQL file loaded: {len(sql_content)} characters")
+        logger.info(f"SQL file loaded: {sql_size} bytes")
         
         # Try different connection approaches
         connection_configs = [
@@ -124,27 +146,30 @@ def execute_migration_with_retry():
             try:
                 logger.info(f"Trying connection approach {i}/3...")
                 
-                conn = psycopg2.connect(
-                    config['dsn'],
-                    cursor_factory=RealDictCursor,
-                    **{k: v for k, v in config.items() if k != 'dsn'}
-                )
+                pool = get_connection_pool(config)
                 
                 logger.info("✅ Database connection established!")
                 
                 # Execute migration
-                with conn.cursor() as cursor:
+                with pool.connection() as conn, conn.cursor() as cursor:
                     logger.info("Executing CADS migration SQL...")
                     
                     # Split and execute statements
-                    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+                    statements = split_sql_statements(sql_content)
                     successful = 0
                     
-                    for j, statement in enumerate(statements, 1):
-                        if statement:
+                    # One commit for the whole migration; each statement gets a
+                    # savepoint so a skipped error keeps the work before it.
+                    # Pipelining sends SAVEPOINT, statement and RELEASE together.
+                    with conn.transaction(), conn.pipeline():
+                        for j, statement in enumerate(statements, 1):
+                            if TRANSACTION_CONTROL_RE.match(statement):
+                                # The script's own BEGIN/COMMIT would end our transaction
+                                continue
+                            
                             try:
-                                cursor.execute(statement)
-                                conn.commit()
+                                with conn.transaction():
+                                    cursor.execute(statement)
                                 successful += 1
                                 
                                 if j % 5 == 0:
@@ -154,11 +179,9 @@ def execute_migration_with_retry():
                                 error_msg = str(e).lower()
                                 if any(skip in error_msg for skip in ['already exists', 'duplicate']):
                                     logger.warning(f"Skipping: {e}")
-                                    conn.rollback()
                                     continue
                                 else:
                                     logger.error(f"Statement {j} failed: {e}")
-                                    conn.rollback()
                                     raise
                     
                     logger.info(f"Successfully executed {successful}/{len(statements)} statements")
@@ -166,7 +189,6 @@ def execute_migration_with_retry():
                     # Get results
                     results = get_migration_results(cursor)
                     
-                conn.close()
                 return True, results
                 
             except Exception as e:
@@ -180,6 +202,9 @@ def execute_migration_with_retry():
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         return False, {}
+    
+    finally:
+        close_connection_pools()
 
 
 def get_migration_results(cursor):
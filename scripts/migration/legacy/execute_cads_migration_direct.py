@@ -5,10 +5,29 @@ Execute CADS migration using DATABASE_URL from .env file with direct connection.
 import os
 import sys
 import logging
-import time
 from typing import Optional
 from dotenv import load_dotenv
 
+from _common import (
+    TRANSACTION_CONTROL_RE,
+    normalize_database_url,
+    parse_db_url,
+    read_sql_file,
+    resolve_host,
+    split_sql_statements,
+)
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:
+    psycopg = None
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
 # Load environment variables
 load_dotenv()
 
@@ -24,167 +43,154 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the first pooled connection, retries included
+POOL_OPEN_TIMEOUT = 60
 
-def create_connection_with_retries():
-    """Create database connection with multiple retry strategies."""
+# Connection pool shared by this run; opened by get_connection_pool()
+_pool = None
+
+
+def get_connection_pool():
+    """Open the migration's connection pool on first use; the pool retries failed connects."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    
+    if psycopg is None or ConnectionPool is None:
+        logger.error("psycopg not available. Install with: pip install 'psycopg[binary,pool]'")
+        return None
+    
+    pool = None
     try:
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
-        
         database_url = os.getenv('DATABASE_URL')
         if not database_url:
             raise ValueError("DATABASE_URL not found in environment variables")
+        database_url = normalize_database_url(database_url)
         
         logger.info(f"Using DATABASE_URL: {database_url[:50]}...")
         
         # Parse URL components
-        import urllib.parse
-        parsed = urllib.parse.urlparse(database_url)
+        db_url = parse_db_url(database_url)
         
-        logger.info(f"Connecting to host: {parsed.hostname}")
-        logger.info(f"Port: {parsed.port}")
-        logger.info(f"Database: {parsed.path[1:]}")
-        logger.info(f"Username: {parsed.username}")
+        logger.info(f"Connecting to host: {db_url.host}")
+        logger.info(f"Port: {db_url.port}")
+        logger.info(f"Database: {db_url.dbname}")
+        logger.info(f"Username: {db_url.user}")
         
-        # Connection parameters
+        # Connection parameters on top of the URL
         conn_params = {
-            'host': parsed.hostname,
-            'port': parsed.port or 5432,
-            'database': parsed.path[1:],  # Remove leading slash
-            'user': parsed.username,
-            'password': parsed.password,
-            'cursor_factory': RealDictCursor,
+            'row_factory': dict_row,
+            # Transactions are opened explicitly with conn.transaction()
+            'autocommit': True,
+            # Server-side prepare statements the migration repeats
+            'prepare_threshold': 5,
             'connect_timeout': 30,
             'sslmode': 'require',
             'application_name': 'CADS_Migration_Script'
         }
         
-        # Try connection with retries
-        max_retries = 5
-        retry_delays = [1, 2, 5, 10, 15]  # Progressive delays
+        # Resolve once so pooled reconnects skip DNS; host stays in the URL for TLS
+        hostaddr = resolve_host(db_url.host, db_url.port)
+        if hostaddr:
+            logger.info(f"Resolved {db_url.host} to {hostaddr}")
+            conn_params['hostaddr'] = hostaddr
         
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Connection attempt {attempt + 1}/{max_retries}")
-                
-                # Try to connect
-                conn = psycopg2.connect(**conn_params)
-                
-                # Test the connection
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT version();")
-                    version = cursor.fetchone()
-                    logger.info(f"Connected successfully! Database version: {version['version'][:100]}...")
-                
-                return conn
-                
-            except psycopg2.OperationalError as e:
-                error_msg = str(e)
-                logger.warning(f"Connection attempt {attempt + 1} failed: {error_msg}")
-                
-                # Check for specific error types
-                if "could not translate host name" in error_msg:
-                    logger.error("DNS resolution failed - this appears to be a network connectivity issue")
-                elif "timeout" in error_msg.lower():
-                    logger.warning("Connection timeout - retrying with longer timeout")
-                    conn_params['connect_timeout'] = min(60, conn_params['connect_timeout'] * 2)
-                elif "authentication failed" in error_msg.lower():
-                    logger.error("Authentication failed - check credentials")
-                    break
-                
-                if attempt < max_retries - 1:
-                    delay = retry_delays[attempt]
-                    logger.info(f"Waiting {delay} seconds before retry...")
-                    time.sleep(delay)
-                else:
-                    raise
-            
-            except Exception as e:
-                logger.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                else:
-                    raise
+        # The pool retries failed connects with backoff until reconnect_timeout
+        pool = ConnectionPool(
+            conninfo=database_url,
+            min_size=1,
+            max_size=4,
+            kwargs=conn_params,
+            reconnect_timeout=POOL_OPEN_TIMEOUT,
+            name='cads_migration',
+            open=False
+        )
+        pool.open(wait=True, timeout=POOL_OPEN_TIMEOUT)
         
-        return None
+        # Test the connection
+        with pool.connection() as conn:
+            version = conn.execute("SELECT version();").fetchone()
+            logger.info(f"Connected successfully! Database version: {version['version'][:100]}...")
+        
+        _pool = pool
+        return pool
         
-    except ImportError:
-        logger.error("psycopg2 not available. Install with: pip install psycopg2-binary")
-        return None
     except Exception as e:
         logger.error(f"Connection setup failed: {e}")
+        if pool is not None:
+            pool.close()
         return None
 
 
-def execute_sql_statements(conn, sql_content: str):
-    """Execute SQL statements one by one."""
+def close_connection_pool():
+    """Close the shared connection pool, if it was opened."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+def execute_statement(conn, cursor, statement: str, label: str) -> bool:
+    """
+    Execute one statement inside a savepoint, skipping expected errors.
+    
+    Returns:
+        True if the statement ran, False if it was skipped
+    """
+    # Log statement type
+    stmt_type = statement.split()[0].upper() if statement.split() else "UNKNOWN"
+    logger.info(f"Executing statement {label}: {stmt_type}")
+    
+    if TRANSACTION_CONTROL_RE.match(statement):
+        logger.info("  → Skipped: the migration already runs in a single transaction")
+        return False
+    
     try:
-        # Clean and split SQL into statements
-        statements = []
-        current_statement = ""
+        # A failure only rolls back to this statement's savepoint
+        with conn.transaction():
+            cursor.execute(statement)
         
-        for line in sql_content.split('\n'):
-            line = line.strip()
-            
-            # Skip comments and empty lines
-            if not line or line.startswith('--'):
-                continue
-            
-            current_statement += line + '\n'
-            
-            # Check if statement is complete (ends with semicolon)
-            if line.endswith(';'):
-                statements.append(current_statement.strip())
-                current_statement = ""
+        # Get row count if applicable
+        if cursor.rowcount >= 0:
+            logger.info(f"  → Affected {cursor.rowcount} rows")
+        
+        return True
         
-        # Add any remaining statement
-        if current_statement.strip():
-            statements.append(current_statement.strip())
+    except psycopg.Error as e:
+        error_msg = str(e)
+        
+        # Handle expected errors gracefully
+        if any(phrase in error_msg.lower() for phrase in [
+            "already exists", "duplicate", "constraint", "does not exist"
+        ]):
+            logger.warning(f"  → Expected error (continuing): {error_msg}")
+            return False
+        else:
+            logger.error(f"  → SQL Error: {error_msg}")
+            logger.error(f"  → Statement: {statement[:200]}...")
+            raise
+    
+    except Exception as e:
+        logger.error(f"  → Unexpected error: {e}")
+        logger.error(f"  → Statement: {statement[:200]}...")
+        raise
+
+
+def execute_sql_statements(conn, sql_content: str):
+    """Execute SQL statements in one transaction, each under its own savepoint."""
+    try:
+        statements = split_sql_statements(sql_content)
         
         logger.info(f"Executing {len(statements)} SQL statements...")
         
         executed_count = 0
-        with conn.cursor() as cursor:
-            for i, statement in enumerate(statements, 1):
-                if not statement:
-                    continue
-                
-                try:
-                    # Log statement type
-                    stmt_type = statement.split()[0].upper() if statement.split() else "UNKNOWN"
-                    logger.info(f"Executing statement {i}/{len(statements)}: {stmt_type}")
-                    
-                    # Execute statement
-                    cursor.execute(statement)
-                    conn.commit()
-                    
-                    # Get row count if applicable
-                    if cursor.rowcount >= 0:
-                        logger.info(f"  → Affected {cursor.rowcount} rows")
-                    
+        # One commit for the whole migration; an unexpected error rolls all of it back.
+        # Each savepoint is a pipeline sync point, but its SAVEPOINT, statement
+        # and RELEASE share one round trip.
+        with conn.transaction(), conn.pipeline(), conn.cursor() as cursor:
+            for index, statement in enumerate(statements, 1):
+                if execute_statement(conn, cursor, statement, f"{index}/{len(statements)}"):
                     executed_count += 1
-                    
-                except psycopg2.Error as e:
-                    error_msg = str(e)
-                    
-                    # Handle expected errors gracefully
-                    if any(phrase in error_msg.lower() for phrase in [
-                        "already exists", "duplicate", "constraint", "does not exist"
-                    ]):
-                        logger.warning(f"  → Expected error (continuing): {error_msg}")
-                        conn.rollback()
-                        continue
-                    else:
-                        logger.error(f"  → SQL Error: {error_msg}")
-                        logger.error(f"  → Statement: {statement[:200]}...")
-                        conn.rollback()
-                        raise
-                
-                except Exception as e:
-                    logger.error(f"  → Unexpected error: {e}")
-                    logger.error(f"  → Statement: {statement[:200]}...")
-                    conn.rollback()
-                    raise
         
         logger.info(f"Successfully executed {executed_count}/{len(statements)} statements")
         return True
@@ -247,17 +253,16 @@ def main():
             return False
         
         # Read SQL content
-        with open(sql_file, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
+        sql_content, sql_size = read_sql_file(sql_file)
         
-        logger.info(f"Read SQL file: {len(sql_content)} characters")
-        print(f"📄 SQL file loaded: {len(sql_content)} characters")
+        logger.info(f"Read SQL file: {sql_size} bytes")
+        print(f"📄 SQL file loaded: {sql_size} bytes")
         
         # Establish database connection
         print("🔌 Establishing database connection...")
-        conn = create_connection_with_retries()
+        pool = get_connection_pool()
         
-        if not conn:
+        if not pool:
             print("❌ Could not establish database connection")
             print("\n💡 Troubleshooting suggestions:")
             print("1. Check your internet connection")
@@ -267,52 +272,53 @@ def main():
             return False
         
         try:
-            print("✅ Database connection established!")
-            print("📝 Executing CADS migration SQL...")
-            
-            # Execute the SQL
-            success = execute_sql_statements(conn, sql_content)
-            
-            if success:
-                print("✅ CADS migration completed successfully!")
-                
-                # Get migration summary
-                print("\n📊 Migration Summary:")
-                results = get_migration_summary(conn)
+            with pool.connection() as conn:
+                print("✅ Database connection established!")
+                print("📝 Executing CADS migration SQL...")
                 
-                for table, count in results.items():
-                    if table != 'sample_researchers':
-                        print(f"   📋 {table}: {count} records")
+                # Execute the SQL
+                success = execute_sql_statements(conn, sql_content)
                 
-                # Show sample researchers
-                sample_researchers = results.get('sample_researchers', [])
-                if sample_researchers:
-                    print(f"\n👥 Sample CADS Researchers Found:")
-                    for researcher in sample_researchers[:5]:
-                        h_index = researcher['h_index'] or 'N/A'
-                        dept = researcher['department'] or 'N/A'
-                        print(f"   • {researcher['full_name']} (H-index: {h_index}, Dept: {dept})")
+                if success:
+                    print("✅ CADS migration completed successfully!")
                     
-                    if len(sample_researchers) > 5:
-                        print(f"   ... and {len(sample_researchers) - 5} more")
-                
-                print("\n🎯 Tables Created:")
-                print("   • cads_researchers - CADS faculty members")
-                print("   • cads_works - Publications with embeddings & keywords")
-                print("   • cads_topics - Research topics")
-                print("   • cads_researcher_summary - Summary view")
-                
-                print("\n✨ CADS subset is ready for analysis!")
-                print("💡 Use the cads_researcher_summary view for easy querying")
-                
-                return True
-            else:
-                print("❌ Migration failed during SQL execution")
-                return False
-                
+                    # Get migration summary
+                    print("\n📊 Migration Summary:")
+                    results = get_migration_summary(conn)
+                    
+                    for table, count in results.items():
+                        if table != 'sample_researchers':
+                            print(f"   📋 {table}: {count} records")
+                    
+                    # Show sample researchers
+                    sample_researchers = results.get('sample_researchers', [])
+                    if sample_researchers:
+                        print(f"\n👥 Sample CADS Researchers Found:")
+                        for researcher in sample_researchers[:5]:
+                            h_index = researcher['h_index'] or 'N/A'
+                            dept = researcher['department'] or 'N/A'
+                            print(f"   • {researcher['full_name']} (H-index: {h_index}, Dept: {dept})")
+                        
+                        if len(sample_researchers) > 5:
+                            print(f"   ... and {len(sample_researchers) - 5} more")
+                    
+                    print("\n🎯 Tables Created:")
+                    print("   • cads_researchers - CADS faculty members")
+                    print("   • cads_works - Publications with embeddings & keywords")
+                    print("   • cads_topics - Research topics")
+                    print("   • cads_researcher_summary - Summary view")
+                    
+                    print("\n✨ CADS subset is ready for analysis!")
+                    print("💡 Use the cads_researcher_summary view for easy querying")
+                    
+                    return True
+                else:
+                    print("❌ Migration failed during SQL execution")
+                    return False
+        
         finally:
-            conn.close()
-            logger.info("Database connection closed")
+            close_connection_pool()
+            logger.info("Connection pool closed")
         
     except Exception as e:
         logger.error(f"Migration execution failed: {e}")
@@ -34,6 +34,27 @@ def create_sample_dataframe(data_type: str = "works") -> pd.DataFrame:
     else:
         raise ValueError(f"Unknown data type: {data_type}")
 
+def load_script_module(relative_path: str, work_dir: Path):
+    """Import a standalone script by path, running it from work_dir so its log file lands there"""
+    import os
+    import sys
+    import importlib.util
+    
+    script_path = Path(__file__).parent.parent.parent / relative_path
+    # Scripts import their sibling modules by plain name
+    if str(script_path.parent) not in sys.path:
+        sys.path.insert(0, str(script_path.parent))
+    
+    spec = importlib.util.spec_from_file_location(script_path.stem, script_path)
+    module = importlib.util.module_from_spec(spec)
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
 def mock_database_connection():
     """Create a mock database connection for testing"""
     class MockConnection:
@@ -0,0 +1,117 @@
+"""
+Tests for reusing cached clustering artifacts in cads/process_data.py
+"""
+
+import json
+import sys
+
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def process_data():
+    """Provide the process_data module"""
+    try:
+        import process_data
+    except ImportError:
+        pytest.skip("cads.process_data dependencies not available")
+    return process_data
+
+
+@pytest.fixture
+def works():
+    """Provide a small ordered works DataFrame"""
+    return pd.DataFrame({'id': ['a', 'b', 'c'], 'title': ['A', 'B', 'C']})
+
+
+def write_fingerprint(process_data, data_dir, data):
+    """Record a fingerprint the way compute_clusters does"""
+    with open(process_data.cluster_cache_paths(data_dir).fingerprint, 'w') as f:
+        json.dump({'n_rows': len(data), 'fingerprint': process_data.data_fingerprint(data)}, f)
+
+
+class TestCachedClustersMatch:
+    """Test the staleness check for cached UMAP/HDBSCAN results"""
+    
+    def test_matching_fingerprint(self, process_data, works, tmp_path):
+        """Test a cache written for the same works in the same order is reused"""
+        write_fingerprint(process_data, tmp_path, works)
+        
+        assert process_data.cached_clusters_match(tmp_path, works, np.zeros((3, 2)))
+    
+    def test_reordered_works(self, process_data, works, tmp_path):
+        """Test a cache is stale once the work order changes"""
+        write_fingerprint(process_data, tmp_path, works)
+        reordered = works.iloc[[1, 0, 2]].reset_index(drop=True)
+        
+        assert not process_data.cached_clusters_match(tmp_path, reordered, np.zeros((3, 2)))
+    
+    def test_size_mismatch(self, process_data, works, tmp_path):
+        """Test a cache with a different number of points is stale"""
+        write_fingerprint(process_data, tmp_path, works)
+        
+        assert not process_data.cached_clusters_match(tmp_path, works, np.zeros((2, 2)))
+    
+    def test_missing_fingerprint(self, process_data, works, tmp_path):
+        """Test a cache without a fingerprint is never trusted on size alone"""
+        assert not process_data.cached_clusters_match(tmp_path, works, np.zeros((3, 2)))
+
+
+class FakeProcessor:
+    """Stand-in DataProcessor that serves fixed works"""
+    
+    def __init__(self, works):
+        self.works = works
+        self.full_loads = 0
+    
+    def load_cads_data_with_researchers(self, columns=None):
+        return self.works
+    
+    def process_production_dataset(self):
+        self.full_loads += 1
+        return {'data': self.works, 'embeddings': np.ones((len(self.works), 4)), 'validation_passed': True}
+
+
+class TestComputeClustersCache:
+    """Test compute_clusters builds one DataProcessor around the cache probe"""
+    
+    @pytest.fixture
+    def processors(self, process_data, works, tmp_path, monkeypatch):
+        """Point the cache at tmp_path and record every processor created"""
+        created = []
+        
+        def make_processor():
+            created.append(FakeProcessor(works))
+            return created[-1]
+        
+        monkeypatch.setattr(process_data, 'CLUSTER_CACHE_DIR', tmp_path)
+        monkeypatch.setattr(process_data, 'DataProcessor', make_processor)
+        # Keep clustering on the "ML dependencies not available" path
+        for module in ('cuml', 'cuml.manifold', 'umap'):
+            monkeypatch.setitem(sys.modules, module, None)
+        
+        paths = process_data.cluster_cache_paths(tmp_path)
+        np.save(paths.umap_npy, np.zeros((3, 2)))
+        np.save(paths.labels_npy, np.array([0, 0, 1]))
+        return created
+    
+    def test_stale_cache_reuses_processor(self, process_data, works, tmp_path, processors):
+        """Test a stale cache falls through to a full load on the same processor"""
+        result = process_data.compute_clusters()
+        
+        assert len(processors) == 1
+        assert processors[0].full_loads == 1
+        assert result['umap_coordinates'] is None
+    
+    def test_warm_cache_skips_full_load(self, process_data, works, tmp_path, processors):
+        """Test a matching cache is returned without generating embeddings"""
+        write_fingerprint(process_data, tmp_path, works)
+        
+        result = process_data.compute_clusters()
+        
+        assert len(processors) == 1
+        assert processors[0].full_loads == 0
+        assert result['embeddings'] is None
+        assert result['cluster_labels'].tolist() == [0, 0, 1]
@@ -0,0 +1 @@
+# Standalone script tests
@@ -0,0 +1,69 @@
+"""
+Tests for the CADS subset creator (scripts/create_cads_subset.py)
+"""
+
+import sys
+import types
+
+import pytest
+
+from tests.fixtures.test_helpers import load_script_module
+
+
+@pytest.fixture
+def subset_module(tmp_path, monkeypatch):
+    """Import the script with a stand-in for the app database layer"""
+    database_manager = types.ModuleType("app.database.database_manager")
+    database_manager.DatabaseManager = lambda: None
+    for name, module in [("app", types.ModuleType("app")),
+                         ("app.database", types.ModuleType("app.database")),
+                         ("app.database.database_manager", database_manager)]:
+        monkeypatch.setitem(sys.modules, name, module)
+    return load_script_module("scripts/create_cads_subset.py", tmp_path)
+
+
+@pytest.fixture
+def creator(subset_module):
+    """Provide a CADSSubsetCreator without a database connection"""
+    return subset_module.CADSSubsetCreator()
+
+
+class TestReadCadsProfessors:
+    """Test parsing of cads.txt"""
+    
+    def test_reads_surname_and_name(self, creator, tmp_path):
+        """Test each tab-separated row becomes a (surname, name) tuple"""
+        cads_file = tmp_path / "cads.txt"
+        cads_file.write_text("Surname\tName\nLiu\tXiangping\n Wescott \t Danny \n", encoding="utf-8")
+        
+        assert creator.read_cads_professors(str(cads_file)) == [("Liu", "Xiangping"), ("Wescott", "Danny")]
+    
+    def test_skips_blank_and_partial_rows(self, creator, tmp_path):
+        """Test rows without both a surname and a name are dropped"""
+        cads_file = tmp_path / "cads.txt"
+        cads_file.write_text("Surname\tName\n \t \nSmith\t\n\tJohn\n\nNo tab here\nLee\tAnn\n", encoding="utf-8")
+        
+        assert creator.read_cads_professors(str(cads_file)) == [("Lee", "Ann")]
+
+
+class TestPickResearcher:
+    """Test choosing a researcher among the trigram candidates"""
+    
+    def test_picks_matching_candidate(self, creator, subset_module):
+        """Test the candidate carrying the professor's name is chosen"""
+        candidates = [
+            subset_module.Researcher(1, "Ann Leeson"),
+            subset_module.Researcher(2, "Xiangping Liu"),
+        ]
+        
+        assert creator.pick_researcher("Xiangping", "Liu", candidates).id == 2
+    
+    def test_rejects_unrelated_candidates(self, creator, subset_module):
+        """Test no candidate is returned when none is close enough"""
+        candidates = [subset_module.Researcher(1, "Maria Gonzalez")]
+        
+        assert creator.pick_researcher("Xiangping", "Liu", candidates) is None
+    
+    def test_no_candidates(self, creator):
+        """Test an empty candidate list yields no match"""
+        assert creator.pick_researcher("Xiangping", "Liu", []) is None
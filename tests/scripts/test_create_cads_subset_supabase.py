@@ -0,0 +1,67 @@
+"""
+Tests for the Supabase CADS subset generator (scripts/create_cads_subset_supabase.py)
+"""
+
+import pytest
+
+from tests.fixtures.test_helpers import load_script_module
+
+
+@pytest.fixture
+def creator(tmp_path, monkeypatch):
+    """Provide a CADSSupabaseCreator for a dummy Supabase DATABASE_URL"""
+    monkeypatch.setenv("DATABASE_URL", "postgresql://postgres:pw@db.testproject.supabase.co:5432/postgres")
+    module = load_script_module("scripts/create_cads_subset_supabase.py", tmp_path)
+    return module.CADSSupabaseCreator()
+
+
+class TestReadCadsProfessors:
+    """Test parsing of cads.txt"""
+    
+    def test_reads_surname_and_name(self, creator, tmp_path):
+        """Test each tab-separated row becomes a (surname, name) tuple"""
+        cads_file = tmp_path / "cads.txt"
+        cads_file.write_text("Surname\tName\nLiu\tXiangping\n  Wescott \t Danny \n", encoding="utf-8")
+        
+        assert creator.read_cads_professors(str(cads_file)) == [("Liu", "Xiangping"), ("Wescott", "Danny")]
+    
+    def test_skips_blank_and_partial_rows(self, creator, tmp_path):
+        """Test rows without both a surname and a name are dropped"""
+        cads_file = tmp_path / "cads.txt"
+        cads_file.write_text("Surname\tName\n \t \nSmith\t\n\tJohn\n\nNo tab here\nLee\tAnn\n", encoding="utf-8")
+        
+        assert creator.read_cads_professors(str(cads_file)) == [("Lee", "Ann")]
+
+
+class TestGenerateTableCreationSql:
+    """Test the generated migration script"""
+    
+    def test_includes_professor_patterns(self, creator):
+        """Test each professor becomes one VALUES row with LIKE wildcards"""
+        sql = creator.generate_table_creation_sql([("O'Neil", "Chul-Ho")])
+        
+        assert "('chul%ho', 'o''neil', 'Chul-Ho O''Neil')" in sql
+    
+    @pytest.mark.parametrize("professor", [("", "John"), ("Smith", ""), (" ", " ")])
+    def test_rejects_blank_names(self, creator, professor):
+        """Test a blank surname or name is refused rather than matching every researcher"""
+        with pytest.raises(ValueError):
+            creator.generate_table_creation_sql([professor])
+    
+    def test_adds_tsvector_columns_to_existing_tables(self, creator):
+        """Test re-runs add the tsvector columns before indexing them"""
+        sql = creator.generate_table_creation_sql([("Liu", "Xiangping")])
+        
+        for column in ("title_tsv", "abstract_tsv"):
+            alter = f"ALTER TABLE cads_works ADD COLUMN IF NOT EXISTS {column} TSVECTOR"
+            assert alter in sql
+            assert sql.index(alter) < sql.index(f"gin({column})")
+        assert "DROP INDEX IF EXISTS idx_cads_works_title, idx_cads_works_abstract;" in sql
+    
+    def test_replaces_ivfflat_index(self, creator):
+        """Test the old IVFFlat index is dropped before the HNSW index is built"""
+        sql = creator.generate_table_creation_sql([("Liu", "Xiangping")])
+        
+        drop = "DROP INDEX IF EXISTS idx_cads_works_embedding;"
+        assert drop in sql
+        assert sql.index(drop) < sql.index("CREATE INDEX IF NOT EXISTS idx_cads_works_embedding_hnsw")
@@ -6,15 +6,95 @@ Starts a simple HTTP server to test the application locally
 
 import http.server
 import socketserver
+import socket
 import webbrowser
 import threading
 import time
 import os
+import email.utils
 from pathlib import Path
 
+# Chunk size for streaming files when sendfile is unavailable
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Indexed files up to this size are held in memory and served without file I/O
+FILE_CACHE_MAX_SIZE = 4 * 1024 * 1024
+
+def file_etag(st):
+    """Weak ETag for a stat result; changes whenever the file is rewritten"""
+    return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+def file_validators(file_path, st=None):
+    """Return (etag, last_modified, mtime, size) for a file"""
+    if st is None:
+        st = file_path.stat()
+    return (
+        file_etag(st),
+        email.utils.formatdate(st.st_mtime, usegmt=True),
+        int(st.st_mtime),
+        st.st_size
+    )
+
+def prefetch_file(file_path):
+    """Ask the kernel to pull a file into the page cache ahead of the first sendfile"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def build_file_index(root='public'):
+    """Walk root once, mapping each .json.gz URL path to (file path, validators)"""
+    root = Path(root)
+    index = {}
+    for file_path in root.rglob('*.json.gz'):
+        index['/' + file_path.relative_to(root).as_posix()] = (file_path, file_validators(file_path))
+        prefetch_file(file_path)
+    return index
+
+def load_file_cache(index, max_size=FILE_CACHE_MAX_SIZE):
+    """Read the contents of small indexed files, keyed by URL path"""
+    cache = {}
+    for url_path, (file_path, validators) in index.items():
+        if validators[3] <= max_size:
+            cache[url_path] = file_path.read_bytes()
+    return cache
+
+class FastTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Threaded TCP server tuned for low-latency local serving"""
+    
+    # Serve independent asset requests concurrently; Ctrl+C doesn't wait on them
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+    
+    def server_bind(self):
+        super().server_bind()
+        # Don't let Nagle's algorithm hold back small header/body writes
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 256 * 1024)
+
 class CompressedHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP request handler that serves compressed files correctly"""
     
+    # Keep connections open so a page load reuses one socket for all its assets;
+    # every response carries Content-Length and send_error closes explicitly
+    protocol_version = 'HTTP/1.1'
+    
+    # Set TCP_NODELAY on every accepted connection (not reliably inherited)
+    disable_nagle_algorithm = True
+    
+    # URL path -> (file path, validators) for compressed data; built by start_server
+    # and re-checked against a stat of the file on every request
+    _file_index = {}
+    
+    # URL path -> file contents for the small entries of _file_index
+    _file_cache = {}
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory='public', **kwargs)
     
@@ -36,16 +116,49 @@ class CompressedHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         if self.path.endswith('.json.gz'):
             # Serve compressed JSON with proper headers
             try:
-                file_path = Path('public') / self.path.lstrip('/')
-                if file_path.exists():
+                entry = self._file_index.get(self.path)
+                file_path = entry[0] if entry is not None else Path('public') / self.path.lstrip('/')
+                try:
+                    st = file_path.stat()
+                except FileNotFoundError:
+                    # Missing, or removed since it was indexed
+                    self._file_index.pop(self.path, None)
+                    self._file_cache.pop(self.path, None)
+                    entry = None
+                else:
+                    if entry is None or entry[1][0] != file_etag(st):
+                        # New or rewritten since startup: refresh the validators
+                        # and stop serving the stale in-memory copy
+                        entry = (file_path, file_validators(file_path, st))
+                        self._file_index[self.path] = entry
+                        self._file_cache.pop(self.path, None)
+                
+                if entry is not None:
+                    file_path, (etag, last_modified, mtime, file_size) = entry
+                    
+                    if self.is_not_modified(etag, mtime):
+                        # Client copy is current: skip the body entirely
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Cache-Control', 'public, max-age=3600')
+                        self.end_headers()
+                        return
+                    
                     self.send_response(200)
                     self.send_header('Content-Type', 'application/json')
                     self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('Content-Length', str(file_size))
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', last_modified)
                     self.send_header('Cache-Control', 'public, max-age=3600')
                     self.end_headers()
                     
-                    with open(file_path, 'rb') as f:
-                        self.wfile.write(f.read())
+                    payload = self._file_cache.get(self.path)
+                    if payload is not None:
+                        self.wfile.write(payload)
+                    else:
+                        with open(file_path, 'rb') as f:
+                            self.send_file_body(f, file_size)
                     return
                 else:
                     self.send_error(404)
@@ -57,11 +170,60 @@ class CompressedHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         
         # Default handling for other files
         super().do_GET()
+    
+    def is_not_modified(self, etag, mtime):
+        """Check the request's conditional headers against the file validators"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            candidates = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in candidates or etag in candidates
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since.timestamp() >= mtime
+        
+        return False
+    
+    def send_file_body(self, f, file_size):
+        """Send an open file to the client, zero-copy via os.sendfile where supported"""
+        # Headers may still be buffered; they must reach the socket before the body
+        self.wfile.flush()
+        
+        offset = 0
+        try:
+            while offset < file_size:
+                sent = os.sendfile(self.wfile.fileno(), f.fileno(), offset, file_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile on this platform/socket: copy the rest through userland
+            # (never past Content-Length, even if the file has grown since)
+            f.seek(offset)
+            while offset < file_size:
+                chunk = f.read(min(COPY_BUFFER_SIZE, file_size - offset))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                offset += len(chunk)
+        
+        if offset < file_size:
+            # The file shrank after Content-Length went out; the client would
+            # wait on this keep-alive connection for bytes that never come
+            self.close_connection = True
 
 def start_server(port=8000):
     """Start the local HTTP server"""
     try:
-        with socketserver.TCPServer(("", port), CompressedHTTPRequestHandler) as httpd:
+        # Resolve served data files once instead of per request
+        CompressedHTTPRequestHandler._file_index = build_file_index('public')
+        CompressedHTTPRequestHandler._file_cache = load_file_cache(CompressedHTTPRequestHandler._file_index)
+        
+        with FastTCPServer(("", port), CompressedHTTPRequestHandler) as httpd:
             print(f"🌐 Starting local server at http://localhost:{port}")
             print(f"📁 Serving files from: {Path('public').absolute()}")
             print("🔄 Server is running... Press Ctrl+C to stop")
@@ -98,8 +260,18 @@ def check_prerequisites():
     
     missing_files = []
     
+    # List each parent directory once instead of stat-ing every file
+    dir_entries = {}
+    for parent in {os.path.dirname(file_path) for file_path in required_files}:
+        try:
+            with os.scandir(parent) as entries:
+                dir_entries[parent] = {entry.name for entry in entries}
+        except OSError:
+            dir_entries[parent] = set()
+    
     for file_path in required_files:
-        if not Path(file_path).exists():
+        parent, name = os.path.split(file_path)
+        if name not in dir_entries[parent]:
             missing_files.append(file_path)
         else:
             print(f"  ✅ {file_path}")